@@ -243,12 +243,15 @@ class FileHandler:
             code_files = self._find_code_files(extract_dir)
 
             # Create analysis prompt
-            prompt = f"{context}\n\nProject structure:\n{file_tree}\n\n"
+            prompt_parts = [f"{context}\n\nProject structure:\n{file_tree}\n\n"]
 
             # Add key files
             for file_path in code_files[:5]:  # Limit to 5 files
                 content = file_path.read_text(encoding="utf-8", errors="ignore")
-                prompt += f"\nFile: {file_path.relative_to(extract_dir)}\n```\n{content[:1000]}...\n```\n"
+                prompt_parts.append(
+                    f"\nFile: {file_path.relative_to(extract_dir)}\n```\n{content[:1000]}...\n```\n"
+                )
+            prompt = "".join(prompt_parts)
 
             return ProcessedFile(
                 type="archive",
@@ -1207,13 +1207,14 @@ async def handle_git_callback(
             if not commits:
                 log_message = "📜 <b>Git Log</b>\n\n<i>No commits found.</i>"
             else:
-                log_message = "📜 <b>Git Log</b>\n\n"
+                log_lines = ["📜 <b>Git Log</b>\n\n"]
                 for commit in commits[:10]:  # Show last 10 commits
                     short_hash = commit.hash[:7]
                     short_message = escape_html(commit.message[:60])
                     if len(commit.message) > 60:
                         short_message += "..."
-                    log_message += f"• <code>{short_hash}</code> {short_message}\n"
+                    log_lines.append(f"• <code>{short_hash}</code> {short_message}\n")
+                log_message = "".join(log_lines)
 
             keyboard = [
                 [
@@ -78,13 +78,15 @@ class CodexIntegration:
             working_directory=working_directory,
         )
 
-        # Pass through streaming updates
+        # Pass through streaming updates. Without a consumer, pass no callback
+        # so the SDK layer skips building StreamUpdate objects entirely.
         async def stream_handler(update: StreamUpdate):
-            if on_stream:
-                try:
-                    await on_stream(update)
-                except Exception as e:
-                    logger.warning("Stream callback failed", error=str(e))
+            try:
+                await on_stream(update)
+            except Exception as e:
+                logger.warning("Stream callback failed", error=str(e))
+
+        stream_callback = stream_handler if on_stream else None
 
         # Execute command
         try:
@@ -101,7 +103,7 @@ class CodexIntegration:
                     working_directory=working_directory,
                     session_id=codex_session_id,
                     continue_session=should_continue,
-                    stream_callback=stream_handler,
+                    stream_callback=stream_callback,
                     can_use_tool=can_use_tool,
                 )
             except Exception as resume_error:
@@ -125,7 +127,7 @@ class CodexIntegration:
                         working_directory=working_directory,
                         session_id=None,
                         continue_session=False,
-                        stream_callback=stream_handler,
+                        stream_callback=stream_callback,
                         can_use_tool=can_use_tool,
                     )
                 else:
@@ -7,16 +7,38 @@ Compatibility goals:
 """
 
 import asyncio
+import functools
 import json
 import os
+import re
 import shutil
-import tempfile
+import stat
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
 
 import structlog
 
+try:  # POSIX only; used to grow the stdout pipe on Linux.
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None  # type: ignore[assignment]
+
+try:  # Optional C JSON parser; decodes JSONL bytes without a str round-trip.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
 from ..config.settings import Settings
 from .exceptions import (
     CodexMCPError,
@@ -27,6 +49,281 @@ from .exceptions import (
 
 logger = structlog.get_logger()
 
+# Longest line accepted from the codex subprocess pipes. Single JSONL events
+# (e.g. aggregated command output) can be large, but output that never ends
+# a line must not grow the framing buffer without bound.
+_STREAM_LIMIT = 8 * 1024 * 1024
+
+# Bytes requested per read when framing the pipes into lines.
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Requested kernel capacity of the codex stdout pipe (Linux F_SETPIPE_SZ), so
+# bursts of events are written without stalling codex on a full 64 KiB pipe.
+# 1 MiB is the default unprivileged maximum (/proc/sys/fs/pipe-max-size).
+_PIPE_SIZE = 1024 * 1024
+_F_SETPIPE_SZ: Optional[int] = getattr(fcntl, "F_SETPIPE_SZ", None)
+
+# Auth-related vars that, when blank (e.g. empty entries in .env), shadow a
+# valid local Codex login and are dropped before spawning codex.
+_BLANK_SHADOWING_ENV_VARS = (
+    "CODEX_HOME",
+    "OPENAI_API_KEY",
+    "OPENAI_BASE_URL",
+    "OPENAI_API_BASE",
+    "OPENAI_ORG_ID",
+    "OPENAI_PROJECT",
+)
+
+# Flags that all switch Codex into no-approval/no-sandbox mode.
+_YOLO_ALIASES = frozenset({"--yolo", "--dangerously-bypass-approvals-and-sandbox"})
+
+# Event kinds that carry a Codex failure, shared by the error extractor and
+# the payload-logging check so the two lists cannot drift apart.
+_ERROR_EVENT_KINDS = frozenset(
+    {"error", "turn.failed", "response.failed", "session.failed"}
+)
+
+# Codex tool names (lowercased) mapped onto the tool names the bot's
+# authorizer and UI understand.
+_TOOL_ALIASES: Dict[str, str] = {
+    "read": "Read",
+    "read_file": "Read",
+    "write": "Write",
+    "write_file": "Write",
+    "edit": "Edit",
+    "edit_file": "Edit",
+    "multi_edit": "MultiEdit",
+    "multiedit": "MultiEdit",
+    "bash": "Bash",
+    "shell": "Bash",
+    "glob": "Glob",
+    "grep": "Grep",
+    "ls": "LS",
+    "task": "Task",
+    "web_fetch": "WebFetch",
+    "webfetch": "WebFetch",
+    "web_search": "WebSearch",
+    "websearch": "WebSearch",
+    "todo_read": "TodoRead",
+    "todo_write": "TodoWrite",
+    "notebook_read": "NotebookRead",
+    "notebook_edit": "NotebookEdit",
+}
+
+# Known failure signatures in Codex error output, matched in a single pass.
+_ERROR_SIGNATURES = re.compile(
+    r"(?P<mcp>mcp)"
+    r"|(?P<not_logged_in>not logged in)"
+    r"|(?P<no_last_message>no last agent message; wrote empty content)",
+    re.IGNORECASE,
+)
+
+
+# Decoder for one JSONL event line, bound once: orjson when installed, else the
+# stdlib. Both accept bytes and raise ValueError (JSONDecodeError /
+# UnicodeDecodeError) on malformed input.
+_decode_event: Callable[[bytes], Any] = (
+    orjson.loads if orjson is not None else json.loads
+)
+
+
+def _parse_event_line(raw: bytes) -> Any:
+    """Decode one JSONL event, tolerating invalid UTF-8 inside it.
+
+    Output such as truncated tool results can carry invalid UTF-8, which the
+    byte decoders reject (orjson as JSONDecodeError, the stdlib as
+    UnicodeDecodeError). Such lines are re-decoded from replacement-decoded
+    text; a ValueError from that retry means the JSON itself is malformed.
+    """
+    try:
+        return _decode_event(raw)
+    except ValueError:
+        return json.loads(raw.decode("utf-8", errors="replace"))
+
+
+def _match_error_signatures(text: str) -> FrozenSet[str]:
+    """Return the names of the ``_ERROR_SIGNATURES`` groups found in ``text``."""
+    return frozenset(
+        match.lastgroup for match in _ERROR_SIGNATURES.finditer(text) if match.lastgroup
+    )
+
+
+def _grow_pipe(fd: int) -> None:
+    """Best-effort request for a larger pipe buffer; no-op off Linux."""
+    if _F_SETPIPE_SZ is None:
+        return
+    try:
+        fcntl.fcntl(fd, _F_SETPIPE_SZ, _PIPE_SIZE)
+    except OSError as e:
+        logger.debug("Could not resize codex stdout pipe", error=str(e))
+
+
+def _transport_fileno(transport: asyncio.BaseTransport) -> Optional[int]:
+    """Return the fd behind a read pipe transport, on any event loop.
+
+    The stdlib loop exposes the pipe as ``get_extra_info("pipe")``; uvloop
+    leaves that None and exposes a socket-like object under ``"socket"``.
+    """
+    for key in ("pipe", "socket"):
+        pipe = transport.get_extra_info(key)
+        if pipe is not None:
+            return pipe.fileno()
+    fileno = getattr(transport, "fileno", None)
+    return fileno() if callable(fileno) else None
+
+
+def _grow_stdout_pipe(process: asyncio.subprocess.Process) -> None:
+    """Apply ``_grow_pipe`` to the read end of the process's stdout pipe.
+
+    Relies on loop internals: ``asyncio.subprocess.Process._transport`` and
+    ``get_pipe_transport(1)`` (CPython's base subprocess transport, and
+    uvloop's ``UVProcessTransport``). Any change there leaves the pipe at
+    its default size instead of failing the spawn.
+    """
+    try:
+        transport = getattr(process, "_transport", None)
+        if transport is None:
+            return
+        pipe_transport = transport.get_pipe_transport(1)
+        fd = _transport_fileno(pipe_transport) if pipe_transport else None
+        if fd is None:
+            return
+        # uvloop connects the child's stdout through a socketpair rather
+        # than a pipe; there is no pipe buffer to resize then.
+        if not stat.S_ISFIFO(os.fstat(fd).st_mode):
+            return
+    except (AttributeError, OSError) as e:
+        logger.debug("Could not locate codex stdout pipe", error=str(e))
+        return
+    _grow_pipe(fd)
+
+
+async def _iter_lines(stream: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """Yield lines (without the newline) from ``stream``, reading in chunks.
+
+    Each await pulls whatever the pipe has buffered, so a burst of short
+    events is framed in one pass instead of one ``readline()`` per event.
+    A trailing line without a newline is yielded at EOF. Lines longer than
+    ``_STREAM_LIMIT`` are logged and skipped up to their newline.
+    """
+    buffer = bytearray()
+    discarding = False
+    while True:
+        chunk = await stream.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        start = 0
+        with memoryview(buffer) as view:
+            while (end := buffer.find(b"\n", start)) != -1:
+                if discarding:
+                    discarding = False
+                elif end - start > _STREAM_LIMIT:
+                    logger.warning(
+                        "Skipping oversized Codex output line", limit=_STREAM_LIMIT
+                    )
+                else:
+                    yield bytes(view[start:end])
+                start = end + 1
+        del buffer[:start]
+        if discarding:
+            buffer.clear()
+        elif len(buffer) > _STREAM_LIMIT:
+            logger.warning("Skipping oversized Codex output line", limit=_STREAM_LIMIT)
+            discarding = True
+            buffer.clear()
+    if buffer and not discarding:
+        yield bytes(buffer)
+
+
+@functools.lru_cache(maxsize=32)
+def _codex_argv_prefix(
+    codex: str,
+    is_resume: bool,
+    yolo: bool,
+    sandbox_enabled: bool,
+    model: Optional[str],
+    max_budget_usd: Optional[float],
+    extra_args: Tuple[Any, ...],
+) -> Tuple[str, ...]:
+    """Build the ``codex exec`` argv up to (not including) session id and prompt.
+
+    Depends only on settings values, so it is memoized on them; changing a
+    setting simply produces a different cache key.
+    """
+    if is_resume:
+        # For `codex exec resume`, options must come before SESSION_ID.
+        # Also, current Codex versions don't accept `--sandbox` in resume mode.
+        mode: Tuple[str, ...] = ("resume", "--json", "--skip-git-repo-check")
+        approval: Tuple[str, ...] = ("--yolo",) if yolo else ()
+    else:
+        mode = ("--json", "--skip-git-repo-check")
+        # Default to YOLO mode unless explicitly disabled in config.
+        if yolo:
+            approval = ("--yolo",)
+        # Otherwise use explicit sandbox mode for predictable behavior.
+        elif sandbox_enabled:
+            approval = ("--sandbox", "workspace-write")
+        else:
+            approval = ("--sandbox", "danger-full-access")
+
+    model_args: Tuple[str, ...] = ("--model", model) if model else ()
+
+    budget_args: Tuple[str, ...] = (
+        ("-c", f"max_budget_usd={float(max_budget_usd)}")
+        if max_budget_usd is not None
+        else ()
+    )
+
+    if is_resume:
+        # `codex exec resume` rejects `--sandbox`; strip it even if provided
+        # in CODEX_EXTRA_ARGS for normal `codex exec` calls.
+        sanitized_args: List[str] = []
+        skip_next = False
+        for arg in extra_args:
+            if skip_next:
+                skip_next = False
+                continue
+            if not isinstance(arg, str):
+                continue
+            cleaned = arg.strip()
+            if not cleaned:
+                continue
+            if cleaned == "--sandbox":
+                skip_next = True
+                continue
+            if cleaned.startswith("--sandbox="):
+                continue
+            sanitized_args.append(cleaned)
+        extra_args = tuple(sanitized_args)
+
+    extras: List[str] = []
+    has_yolo = "--yolo" in approval
+    for arg in extra_args:
+        if not isinstance(arg, str):
+            continue
+
+        cleaned = arg.strip()
+        if not cleaned:
+            continue
+
+        if cleaned in _YOLO_ALIASES:
+            if has_yolo:
+                continue
+            has_yolo = True
+
+        extras.append(cleaned)
+
+    return (
+        codex,
+        "exec",
+        *mode,
+        *approval,
+        *model_args,
+        *budget_args,
+        *extras,
+    )
+
 
 def find_codex_cli(
     codex_cli_path: Optional[str] = None,
@@ -65,7 +362,7 @@ def find_codex_cli(
     return None
 
 
-@dataclass
+@dataclass(slots=True)
 class CodexResponse:
     """Response object kept for compatibility with existing callers."""
 
@@ -79,7 +376,7 @@ class CodexResponse:
     tools_used: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamUpdate:
     """Streaming update object kept for compatibility with existing callers."""
 
@@ -120,12 +417,6 @@ class CodexSDKManager:
         """Execute command via ``codex exec``."""
         start_time = asyncio.get_running_loop().time()
 
-        output_file = tempfile.NamedTemporaryFile(
-            prefix="codex-last-message-", suffix=".txt", delete=False
-        )
-        output_path = Path(output_file.name)
-        output_file.close()
-
         state: Dict[str, Any] = {
             "session_id": None,
             "turn_count": 0,
@@ -145,7 +436,6 @@ class CodexSDKManager:
                 prompt=prompt,
                 session_id=session_id,
                 continue_session=continue_session,
-                output_path=output_path,
             )
             env = self._build_environment()
 
@@ -171,27 +461,29 @@ class CodexSDKManager:
                     "`codex` is available in PATH, or set CODEX_CLI_PATH."
                 ) from e
 
+            _grow_stdout_pipe(process)
+
             async def _read_stdout() -> None:
                 assert process.stdout is not None
-                while True:
-                    line = await process.stdout.readline()
-                    if not line:
-                        break
-
-                    text = line.decode("utf-8", errors="replace").strip()
-                    if not text:
+                async for line in _iter_lines(process.stdout):
+                    raw = line.strip()
+                    if not raw:
                         continue
 
-                    if not text.startswith("{"):
+                    if not raw.startswith(b"{"):
                         # Ignore non-JSON line noise (warnings, progress bars, etc.).
+                        text = raw.decode("utf-8", errors="replace")
                         logger.debug("Codex non-JSON stdout", line=text)
                         state["non_json_stdout"].append(text)
                         continue
 
                     try:
-                        event = json.loads(text)
-                    except json.JSONDecodeError:
-                        logger.debug("Skipping invalid JSONL line", line=text[:200])
+                        event = _parse_event_line(raw)
+                    except ValueError:
+                        logger.debug(
+                            "Skipping invalid JSONL line",
+                            line=raw[:200].decode("utf-8", errors="replace"),
+                        )
                         continue
 
                     event_type = str(event.get("type", "unknown"))
@@ -207,10 +499,7 @@ class CodexSDKManager:
 
             async def _read_stderr() -> None:
                 assert process.stderr is not None
-                while True:
-                    line = await process.stderr.readline()
-                    if not line:
-                        break
+                async for line in _iter_lines(process.stderr):
                     text = line.decode("utf-8", errors="replace").rstrip()
                     if text:
                         state["stderr_lines"].append(text)
@@ -222,17 +511,8 @@ class CodexSDKManager:
 
             duration_ms = int((asyncio.get_running_loop().time() - start_time) * 1000)
 
-            content = ""
-            content_from_assistant = False
-            if output_path.exists():
-                content = output_path.read_text(encoding="utf-8", errors="replace")
-                if content.strip():
-                    content_from_assistant = True
-
-            if not content.strip():
-                content = "\n".join(state["text_fragments"]).strip()
-                if content.strip():
-                    content_from_assistant = True
+            content = "\n".join(state["text_fragments"]).strip()
+            content_from_assistant = bool(content)
 
             diagnostics = "\n".join(
                 [*state["stderr_lines"], *state["non_json_stdout"]]
@@ -260,11 +540,11 @@ class CodexSDKManager:
                         f"{err_text} (events: {', '.join(state['event_types'][-8:])})"
                     )
 
-                err_lower = err_text.lower()
-                if "mcp" in err_lower:
+                signatures = _match_error_signatures(err_text)
+                if "mcp" in signatures:
                     raise CodexMCPError(f"MCP server error: {err_text}")
 
-                if "not logged in" in err_lower:
+                if "not_logged_in" in signatures:
                     raise CodexProcessError(
                         "Codex CLI is not logged in. Run `codex login` on the host "
                         "running this bot, then retry."
@@ -273,7 +553,7 @@ class CodexSDKManager:
                 # Newer Codex versions may emit this warning and non-zero exit when
                 # no final assistant artifact is available for --output-last-message.
                 # We still salvage streamed text when possible.
-                if "no last agent message; wrote empty content" in err_lower:
+                if "no_last_message" in signatures:
                     logger.warning(
                         "Codex returned no final assistant artifact; "
                         "falling back to streamed content",
@@ -337,120 +617,49 @@ class CodexSDKManager:
                     pass
             raise
 
-        finally:
-            try:
-                output_path.unlink(missing_ok=True)
-            except Exception:
-                logger.debug("Failed to remove temp output file", path=str(output_path))
-
     def _build_codex_command(
         self,
         prompt: str,
         session_id: Optional[str],
         continue_session: bool,
-        output_path: Path,
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         # Some call sites intentionally pass an empty prompt to mean "continue".
         # Codex expects a non-empty prompt for reliable non-interactive execution.
         if continue_session and not prompt.strip():
             prompt = "Please continue where we left off."
 
-        codex = self.codex_path or "codex"
-        cmd: List[str] = [codex, "exec"]
-
         is_resume = continue_session and bool(session_id)
-        if is_resume:
-            cmd.append("resume")
-            # For `codex exec resume`, options must come before SESSION_ID.
-            # Also, current Codex versions don't accept `--sandbox` in resume mode.
-            cmd.extend(["--json", "--skip-git-repo-check"])
-            if getattr(self.config, "codex_yolo", True):
-                cmd.append("--yolo")
-        else:
-            cmd.extend(["--json", "--skip-git-repo-check"])
-
-            # Default to YOLO mode unless explicitly disabled in config.
-            if getattr(self.config, "codex_yolo", True):
-                cmd.append("--yolo")
-            # Otherwise use explicit sandbox mode for predictable behavior.
-            elif self.config.sandbox_enabled:
-                cmd.extend(["--sandbox", "workspace-write"])
-            else:
-                cmd.extend(["--sandbox", "danger-full-access"])
-
-        model = getattr(self.config, "codex_model", None)
-        if model:
-            cmd.extend(["--model", model])
-
-        max_budget_usd = getattr(self.config, "codex_max_budget_usd", None)
-        if max_budget_usd is not None:
-            cmd.extend(["-c", f"max_budget_usd={float(max_budget_usd)}"])
-
-        extra_args = getattr(self.config, "codex_extra_args", None) or []
-        if is_resume:
-            # `codex exec resume` rejects `--sandbox`; strip it even if provided
-            # in CODEX_EXTRA_ARGS for normal `codex exec` calls.
-            sanitized_args: List[str] = []
-            skip_next = False
-            for arg in extra_args:
-                if skip_next:
-                    skip_next = False
-                    continue
-                if not isinstance(arg, str):
-                    continue
-                cleaned = arg.strip()
-                if not cleaned:
-                    continue
-                if cleaned == "--sandbox":
-                    skip_next = True
-                    continue
-                if cleaned.startswith("--sandbox="):
-                    continue
-                sanitized_args.append(cleaned)
-            extra_args = sanitized_args
-
-        for arg in extra_args:
-            if not isinstance(arg, str):
-                continue
-
-            cleaned = arg.strip()
-            if not cleaned:
-                continue
-
-            yolo_aliases = {"--yolo", "--dangerously-bypass-approvals-and-sandbox"}
-            if cleaned in yolo_aliases and any(flag in cmd for flag in yolo_aliases):
-                continue
-
-            cmd.append(cleaned)
+        extra_args = getattr(self.config, "codex_extra_args", None) or ()
+        prefix = _codex_argv_prefix(
+            self.codex_path or "codex",
+            is_resume,
+            getattr(self.config, "codex_yolo", True),
+            bool(self.config.sandbox_enabled),
+            getattr(self.config, "codex_model", None),
+            getattr(self.config, "codex_max_budget_usd", None),
+            tuple(extra_args),
+        )
 
         if is_resume and session_id:
-            cmd.append(session_id)
-
-        cmd.append(prompt)
-        return cmd
+            return (*prefix, session_id, prompt)
+        return (*prefix, prompt)
 
     def _build_environment(self) -> Dict[str, str]:
         env = os.environ.copy()
 
-        # Empty auth-related vars in .env can shadow valid local Codex login state.
-        # Remove blank values before spawning codex.
-        for key in (
-            "CODEX_HOME",
-            "OPENAI_API_KEY",
-            "OPENAI_BASE_URL",
-            "OPENAI_API_BASE",
-            "OPENAI_ORG_ID",
-            "OPENAI_PROJECT",
-        ):
+        # Only these keys are checked; the rest of the environment is passed
+        # through untouched.
+        for key in _BLANK_SHADOWING_ENV_VARS:
             val = env.get(key)
-            if val is not None and not str(val).strip():
-                env.pop(key, None)
+            if val is not None and not val.strip():
+                del env[key]
 
         codex_home = getattr(self.config, "codex_home", None)
         if codex_home:
-            expanded = Path(codex_home).expanduser()
-            if str(expanded).strip() and str(expanded) != ".":
-                env["CODEX_HOME"] = str(expanded)
+            # Settings expands "~" when the value is loaded.
+            expanded = str(codex_home)
+            if expanded.strip() and expanded != ".":
+                env["CODEX_HOME"] = expanded
             else:
                 env.pop("CODEX_HOME", None)
 
@@ -470,6 +679,8 @@ class CodexSDKManager:
         ],
     ) -> None:
         event_type = str(event.get("type", ""))
+        # Lower-cased once here; the extract helpers only match on this.
+        event_kind = event_type.lower()
 
         thread_id = event.get("thread_id") or event.get("session_id")
         if isinstance(thread_id, str) and thread_id:
@@ -478,15 +689,12 @@ class CodexSDKManager:
         if event_type == "turn.started":
             state["turn_count"] += 1
 
-        error_text = self._extract_error_text(event)
+        error_text = self._extract_error_text(event, event_kind)
         if error_text:
             state["event_errors"].append(error_text)
-            if error_text in {
-                "error",
-                "turn.failed",
-                "response.failed",
-                "session.failed",
-            }:
+            # The extractor falls back to the event kind when there is no
+            # message; include the payload so the failure can be diagnosed.
+            if error_text in _ERROR_EVENT_KINDS:
                 logger.warning(
                     "Codex event error",
                     event_type=event_type,
@@ -498,7 +706,8 @@ class CodexSDKManager:
                     "Codex event error", event_type=event_type, error=error_text
                 )
 
-        text_chunks = self._extract_text_chunks(event)
+        text_chunks = self._extract_text_chunks(event, event_kind)
+        is_delta = "delta" in event_kind
         for text_chunk in text_chunks:
             normalized = text_chunk.strip()
             if not normalized:
@@ -508,7 +717,7 @@ class CodexSDKManager:
             state["text_fingerprints"].add(normalized)
             state["text_fragments"].append(normalized)
 
-            if stream_callback and "delta" in event_type.lower():
+            if stream_callback and is_delta:
                 try:
                     await stream_callback(
                         StreamUpdate(
@@ -523,7 +732,7 @@ class CodexSDKManager:
                         error=str(callback_error),
                     )
 
-        tool_calls = self._extract_tool_calls(event)
+        tool_calls = self._extract_tool_calls(event, event_kind)
         if tool_calls:
             validated_tool_calls: List[Dict[str, Any]] = []
             for tool in tool_calls:
@@ -584,10 +793,9 @@ class CodexSDKManager:
                         error=str(callback_error),
                     )
 
-    def _extract_text_chunks(self, event: Dict[str, Any]) -> List[str]:
+    def _extract_text_chunks(self, event: Dict[str, Any], event_kind: str) -> List[str]:
         """Extract assistant-facing text from Codex JSON events."""
         chunks: List[str] = []
-        event_type = str(event.get("type", "")).lower()
 
         # Common delta shape: {"type":"...delta","delta":"..."}
         delta = event.get("delta")
@@ -596,7 +804,7 @@ class CodexSDKManager:
 
         # Some events emit text under "text" and "output_text".
         text = event.get("text")
-        if isinstance(text, str) and text.strip() and "delta" in event_type:
+        if isinstance(text, str) and text.strip() and "delta" in event_kind:
             chunks.append(text.strip())
 
         output_text = event.get("output_text")
@@ -630,24 +838,20 @@ class CodexSDKManager:
             isinstance(text, str)
             and text.strip()
             and (
-                "completed" in event_type
-                or "assistant" in event_type
-                or "response" in event_type
+                "completed" in event_kind
+                or "assistant" in event_kind
+                or "response" in event_kind
             )
         ):
             chunks.append(text.strip())
 
         return chunks
 
-    def _extract_error_text(self, event: Dict[str, Any]) -> Optional[str]:
+    def _extract_error_text(
+        self, event: Dict[str, Any], event_kind: str
+    ) -> Optional[str]:
         """Extract structured error text from Codex JSON events."""
-        event_type = str(event.get("type", "")).lower()
-        if event_type not in {
-            "error",
-            "turn.failed",
-            "response.failed",
-            "session.failed",
-        }:
+        if event_kind not in _ERROR_EVENT_KINDS:
             return None
 
         parts: List[str] = []
@@ -681,7 +885,7 @@ class CodexSDKManager:
         deduped = list(dict.fromkeys(parts))
         if deduped:
             return " | ".join(deduped)
-        return event_type or "unknown codex error"
+        return event_kind or "unknown codex error"
 
     def _extract_text_from_message_like(self, message: Dict[str, Any]) -> List[str]:
         chunks: List[str] = []
@@ -720,38 +924,14 @@ class CodexSDKManager:
 
         return chunks
 
-    def _extract_tool_calls(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
-        event_type = str(event.get("type", "")).lower()
+    def _extract_tool_calls(
+        self, event: Dict[str, Any], event_kind: str
+    ) -> List[Dict[str, Any]]:
         tool_calls: List[Dict[str, Any]] = []
-        tool_aliases = {
-            "read": "Read",
-            "read_file": "Read",
-            "write": "Write",
-            "write_file": "Write",
-            "edit": "Edit",
-            "edit_file": "Edit",
-            "multi_edit": "MultiEdit",
-            "multiedit": "MultiEdit",
-            "bash": "Bash",
-            "shell": "Bash",
-            "glob": "Glob",
-            "grep": "Grep",
-            "ls": "LS",
-            "task": "Task",
-            "web_fetch": "WebFetch",
-            "webfetch": "WebFetch",
-            "web_search": "WebSearch",
-            "websearch": "WebSearch",
-            "todo_read": "TodoRead",
-            "todo_write": "TodoWrite",
-            "notebook_read": "NotebookRead",
-            "notebook_edit": "NotebookEdit",
-        }
-
         # Generic shape: {"tool_name": ..., "input": ...}
         tool_name = event.get("tool_name")
         if isinstance(tool_name, str) and tool_name:
-            canonical = tool_aliases.get(tool_name.lower())
+            canonical = _TOOL_ALIASES.get(tool_name.lower())
             if not canonical:
                 return []
             tool_calls.append(
@@ -770,9 +950,9 @@ class CodexSDKManager:
         command = event.get("command")
         if isinstance(command, str) and command.strip():
             if (
-                "exec.command" in event_type
-                or "shell" in event_type
-                or "bash" in event_type
+                "exec.command" in event_kind
+                or "shell" in event_kind
+                or "bash" in event_kind
             ):
                 tool_calls.append(
                     {
@@ -787,7 +967,7 @@ class CodexSDKManager:
         if isinstance(nested, dict):
             name = nested.get("name")
             if isinstance(name, str) and name:
-                canonical = tool_aliases.get(name.lower())
+                canonical = _TOOL_ALIASES.get(name.lower())
                 if not canonical:
                     return []
                 tool_calls.append(
@@ -31,7 +31,7 @@ def _to_utc(dt: datetime) -> datetime:
     return dt.astimezone(UTC)
 
 
-@dataclass
+@dataclass(slots=True)
 class CodexSession:
     """Codex Code session state."""
 
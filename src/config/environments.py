@@ -1,8 +1,25 @@
 """Environment-specific configuration overrides."""
 
+import functools
 from typing import Any, Dict
 
 
+@functools.cache
+def _public_settings(cls: type) -> Dict[str, Any]:
+    """Collect a config class's public, non-callable attributes once.
+
+    The classes are fixed at import; ``as_dict`` returns a copy because
+    callers update the result.
+    """
+    return {
+        key: value
+        for key, value in cls.__dict__.items()
+        if not key.startswith("_")
+        and not callable(value)
+        and not isinstance(value, classmethod)
+    }
+
+
 class DevelopmentConfig:
     """Development environment overrides."""
 
@@ -16,13 +33,7 @@ class DevelopmentConfig:
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
         """Return config as dictionary."""
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_")
-            and not callable(value)
-            and not isinstance(value, classmethod)
-        }
+        return dict(_public_settings(cls))
 
 
 class TestingConfig:
@@ -40,13 +51,7 @@ class TestingConfig:
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
         """Return config as dictionary."""
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_")
-            and not callable(value)
-            and not isinstance(value, classmethod)
-        }
+        return dict(_public_settings(cls))
 
 
 class ProductionConfig:
@@ -64,10 +69,4 @@ class ProductionConfig:
     @classmethod
     def as_dict(cls) -> Dict[str, Any]:
         """Return config as dictionary."""
-        return {
-            key: value
-            for key, value in cls.__dict__.items()
-            if not key.startswith("_")
-            and not callable(value)
-            and not isinstance(value, classmethod)
-        }
+        return dict(_public_settings(cls))
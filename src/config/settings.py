@@ -8,6 +8,7 @@ Features:
 - Environment-specific settings
 """
 
+import functools
 import json
 from pathlib import Path
 from typing import Any, List, Literal, Optional
@@ -28,6 +29,33 @@ from src.utils.constants import (
 )
 
 
+@functools.lru_cache(maxsize=32)
+def _check_mcp_config_file(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Return why an MCP config file is invalid, or None if it is valid.
+
+    Memoized on the file's mtime and size, so repeated Settings loads only
+    re-read and re-parse the file after it changes.
+    """
+    # Validate that the file contains valid JSON with mcpServers
+    try:
+        with open(path) as f:
+            config_data = json.load(f)
+    except json.JSONDecodeError as e:
+        return f"MCP config file is not valid JSON: {e}"
+    if not isinstance(config_data, dict):
+        return "MCP config file must contain a JSON object"
+    if "mcpServers" not in config_data:
+        return (
+            "MCP config file must contain a 'mcpServers' key. "
+            'Format: {"mcpServers": {"name": {"command": ...}}}'
+        )
+    if not isinstance(config_data["mcpServers"], dict):
+        return "'mcpServers' must be an object mapping server names to configurations"
+    if not config_data["mcpServers"]:
+        return "'mcpServers' must contain at least one server configuration"
+    return None
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -297,13 +325,13 @@ class Settings(BaseSettings):
 
     @field_validator("codex_home", mode="before")
     @classmethod
-    def normalize_codex_home(cls, v: Any) -> Optional[Path | str]:
-        """Treat blank CODEX_HOME as unset instead of Path('.')"""
+    def normalize_codex_home(cls, v: Any) -> Optional[Path]:
+        """Treat blank CODEX_HOME as unset and expand ``~`` once at load time."""
         if v is None:
             return None
         if isinstance(v, str) and not v.strip():
             return None
-        return v  # type: ignore[no-any-return]
+        return Path(v).expanduser()
 
     @field_validator("codex_max_budget_usd")
     @classmethod
@@ -337,29 +365,14 @@ class Settings(BaseSettings):
             return v  # type: ignore[no-any-return]
         if isinstance(v, str):
             v = Path(v)
-        if not v.exists():
-            raise ValueError(f"MCP config file does not exist: {v}")
-        # Validate that the file contains valid JSON with mcpServers
         try:
-            with open(v) as f:
-                config_data = json.load(f)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"MCP config file is not valid JSON: {e}")
-        if not isinstance(config_data, dict):
-            raise ValueError("MCP config file must contain a JSON object")
-        if "mcpServers" not in config_data:
-            raise ValueError(
-                "MCP config file must contain a 'mcpServers' key. "
-                'Format: {"mcpServers": {"name": {"command": ...}}}'
-            )
-        if not isinstance(config_data["mcpServers"], dict):
-            raise ValueError(
-                "'mcpServers' must be an object mapping server names to configurations"
-            )
-        if not config_data["mcpServers"]:
-            raise ValueError(
-                "'mcpServers' must contain at least one server configuration"
-            )
+            stat = v.stat()
+        except OSError:
+            # Missing file, a path under a regular file, or an unreadable parent.
+            raise ValueError(f"MCP config file does not exist: {v}")
+        error = _check_mcp_config_file(str(v), stat.st_mtime_ns, stat.st_size)
+        if error:
+            raise ValueError(error)
         return v  # type: ignore[no-any-return]
 
     @field_validator("projects_config_path", mode="before")
@@ -9,7 +9,7 @@ import asyncio
 import uuid
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Type
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Type
 
 import structlog
 
@@ -75,6 +75,25 @@ class EventBus:
         )
         await self._queue.put(event)
 
+    async def publish_many(self, events: Iterable[Event]) -> None:
+        """Publish several events in order without yielding between them.
+
+        The queue is unbounded, so ``put_nowait`` never blocks and the whole
+        batch is enqueued before any handler gets a chance to run.
+        """
+        for event in events:
+            logger.info(
+                "Event published",
+                event_type=event.event_type,
+                event_id=event.id,
+                source=event.source,
+            )
+            self._queue.put_nowait(event)
+
+    async def join(self) -> None:
+        """Wait until every published event has been dispatched."""
+        await self._queue.join()
+
     async def start(self) -> None:
         """Start processing events from the queue."""
         if self._running:
@@ -106,7 +125,10 @@ class EventBus:
             except asyncio.CancelledError:
                 break
 
-            await self._dispatch(event)
+            try:
+                await self._dispatch(event)
+            finally:
+                self._queue.task_done()
 
     async def _dispatch(self, event: Event) -> None:
         """Dispatch event to all matching handlers concurrently."""
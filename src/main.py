@@ -6,7 +6,7 @@ import logging
 import signal
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 import structlog
 
@@ -415,10 +415,23 @@ async def main() -> None:
         sys.exit(1)
 
 
+def _event_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's loop factory when installed, else None (stdlib loop).
+
+    uvloop ships with ``uvicorn[standard]`` on POSIX platforms.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def run() -> None:
     """Synchronous entry point for setuptools."""
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         print("\nShutdown requested by user")
         sys.exit(0)
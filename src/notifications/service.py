@@ -67,7 +67,8 @@ class NotificationService:
         """Queue an agent response for delivery."""
         if not isinstance(event, AgentResponseEvent):
             return
-        await self._send_queue.put(event)
+        # The send queue is unbounded, so this never blocks
+        self._send_queue.put_nowait(event)
 
     async def _process_send_queue(self) -> None:
         """Process queued messages with rate limiting."""
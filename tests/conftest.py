@@ -2,6 +2,8 @@
 
 import pytest
 
+from src.config.settings import Settings
+
 
 @pytest.fixture
 def sample_user_id():
@@ -18,3 +20,17 @@ def sample_config():
         "approved_directory": "/tmp/test_projects",
         "allowed_users": [123456789],
     }
+
+
+@pytest.fixture(scope="session")
+def base_settings(tmp_path_factory):
+    """One validated Settings shared by tests that only read it.
+
+    Derive variants with ``model_copy(update=...)``, which skips validation,
+    so only for fields whose validators are not what the test checks.
+    """
+    return Settings(
+        telegram_bot_token="test_token",
+        telegram_bot_username="test_bot",
+        approved_directory=tmp_path_factory.mktemp("approved"),
+    )
@@ -0,0 +1,138 @@
+"""Shared fixtures for the event handler and notification tests."""
+
+import inspect
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pytest
+import pytest_asyncio
+from telegram import Bot
+
+from src.codex.facade import CodexIntegration
+from src.events.bus import Event, EventBus
+from src.events.handlers import AgentHandler
+from src.events.types import AgentResponseEvent
+from src.notifications.service import NotificationService
+
+_TMP_TEST = Path("/tmp/test")
+_EMPTY_RESPONSE = SimpleNamespace(content="")
+
+# Captured once so the fakes reject calls the real collaborators would, the
+# check autospec would do, without building a spec'd mock per test.
+_RUN_COMMAND_SIGNATURE = inspect.signature(CodexIntegration.run_command)
+_SEND_MESSAGE_SIGNATURE = inspect.signature(Bot.send_message)
+
+
+class FakeCodex:
+    """Stands in for CodexIntegration, recording each run_command call."""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+        self.next_response: Any = _EMPTY_RESPONSE
+        self.raise_: Optional[Exception] = None
+
+    async def run_command(self, **kwargs: Any) -> Any:
+        _RUN_COMMAND_SIGNATURE.bind(self, **kwargs)
+        self.calls.append(kwargs)
+        if self.raise_ is not None:
+            raise self.raise_
+        return self.next_response
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.next_response = _EMPTY_RESPONSE
+        self.raise_ = None
+
+
+class FakeBot:
+    """Stands in for telegram.Bot, recording each send_message call."""
+
+    def __init__(self) -> None:
+        self.sent: List[Dict[str, Any]] = []
+
+    async def send_message(self, **kwargs: Any) -> None:
+        _SEND_MESSAGE_SIGNATURE.bind(self, **kwargs)
+        self.sent.append(kwargs)
+
+
+@dataclass
+class WiredStack:
+    """A running event bus with the agent and notification handlers registered."""
+
+    bus: EventBus
+    handler: AgentHandler
+    service: NotificationService
+    codex: FakeCodex
+    bot: FakeBot
+    responses: List[AgentResponseEvent]
+
+
+@pytest.fixture(scope="session")
+def default_working_directory() -> Path:
+    """Working directory handed to every AgentHandler built in these tests."""
+    return _TMP_TEST
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def wired_stack(default_working_directory: Path) -> AsyncIterator[WiredStack]:
+    """Build and register the stack once per module.
+
+    Module rather than session scope: the bus task lives on the event loop
+    it was started on, and each module runs on its own loop.
+    """
+    bus = EventBus()
+    codex = FakeCodex()
+    bot = FakeBot()
+    handler = AgentHandler(
+        event_bus=bus,
+        codex_integration=codex,  # type: ignore[arg-type]
+        default_working_directory=default_working_directory,
+        default_user_id=42,
+    )
+    service = NotificationService(
+        event_bus=bus,
+        bot=bot,  # type: ignore[arg-type]
+        default_chat_ids=[100, 200],
+    )
+    handler.register()
+    service.register()
+
+    responses: List[AgentResponseEvent] = []
+
+    async def record(event: Event) -> None:
+        responses.append(event)  # type: ignore[arg-type]
+
+    bus.subscribe(AgentResponseEvent, record)
+
+    await bus.start()
+    yield WiredStack(bus, handler, service, codex, bot, responses)
+    await bus.stop()
+
+
+@pytest.fixture
+def stack(wired_stack: WiredStack) -> WiredStack:
+    """The module's wired stack with everything the last test recorded cleared."""
+    wired_stack.codex.reset()
+    wired_stack.bot.sent.clear()
+    wired_stack.responses.clear()
+    wired_stack.service._last_send_per_chat.clear()
+    while not wired_stack.service._send_queue.empty():
+        wired_stack.service._send_queue.get_nowait()
+    return wired_stack
+
+
+@pytest.fixture
+def event_bus(stack: WiredStack) -> EventBus:
+    return stack.bus
+
+
+@pytest.fixture
+def fake_codex(stack: WiredStack) -> FakeCodex:
+    return stack.codex
+
+
+@pytest.fixture
+def fake_bot(stack: WiredStack) -> FakeBot:
+    return stack.bot
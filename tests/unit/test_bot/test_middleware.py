@@ -208,7 +208,6 @@ class TestMiddlewareBlocksSubsequentGroups:
         assert "settings" in captured_data
 
 
-@pytest.mark.asyncio
 async def test_middleware_wrapper_stops_bot_originated_updates() -> None:
     """Middleware wrapper should stop updates sent by bot users."""
     settings = create_test_config()
@@ -234,7 +233,6 @@ async def test_middleware_wrapper_stops_bot_originated_updates() -> None:
     assert middleware_called is False
 
 
-@pytest.mark.asyncio
 async def test_middleware_wrapper_runs_for_non_bot_updates() -> None:
     """Middleware wrapper should execute middleware for user updates."""
     settings = create_test_config()
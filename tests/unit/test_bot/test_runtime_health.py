@@ -3,8 +3,6 @@
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
-import pytest
-
 from src.bot.utils.runtime_health import get_codex_runtime_health
 
 
@@ -18,7 +16,6 @@ class _MockProcess:
         return self._stdout, self._stderr
 
 
-@pytest.mark.asyncio
 async def test_runtime_health_reports_missing_cli():
     bot_data = {"codex_integration": SimpleNamespace(sdk_manager=SimpleNamespace(codex_path=None))}
     health = await get_codex_runtime_health(bot_data)
@@ -26,7 +23,6 @@ async def test_runtime_health_reports_missing_cli():
     assert health["auth"] == "unknown"
 
 
-@pytest.mark.asyncio
 async def test_runtime_health_reports_logged_in_and_uses_cache():
     bot_data = {
         "codex_integration": SimpleNamespace(
@@ -52,7 +48,6 @@ async def test_runtime_health_reports_logged_in_and_uses_cache():
     assert mock_exec.await_count == 1
 
 
-@pytest.mark.asyncio
 async def test_runtime_health_reports_not_logged_in():
     bot_data = {
         "codex_integration": SimpleNamespace(
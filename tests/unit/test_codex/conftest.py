@@ -0,0 +1,32 @@
+"""Shared fixtures for Codex integration tests."""
+
+import asyncio
+from typing import Iterator
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is POSIX/CPython only
+    uvloop = None
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(asyncio.new_event_loop, id="asyncio"),
+        pytest.param(
+            uvloop.new_event_loop if uvloop is not None else None,
+            id="uvloop",
+            marks=pytest.mark.skipif(uvloop is None, reason="uvloop is not installed"),
+        ),
+    ]
+)
+def loop_runner(request: pytest.FixtureRequest) -> Iterator[asyncio.Runner]:
+    """A runner on the stdlib loop and, where installed, on uvloop.
+
+    uvloop is the production loop whenever it is installed (see
+    ``src.main.run``). Tests that depend on the loop's subprocess and pipe
+    internals run their coroutine through this fixture to cover both.
+    """
+    with asyncio.Runner(loop_factory=request.param) as runner:
+        yield runner
@@ -1,9 +1,12 @@
 """Test CodexIntegration facade — force_new skips auto-resume."""
 
-from datetime import datetime
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -12,18 +15,59 @@ from src.codex.facade import CodexIntegration
 from src.codex.session import CodexSession, SessionManager
 from src.config.settings import Settings
 
+# Shared seed timestamp. Taken once at import rather than pinned to a fixed
+# date, because seeded sessions must stay inside session_timeout_hours to be
+# resumable.
+_NOW = datetime.now(UTC)
+_PROJECT = Path("/test/project")
+_USER_ID = 123
+
+
+def _make_mock_response(session_id: str = "new-session-id") -> SimpleNamespace:
+    """Create a stand-in CodexResponse with sensible defaults.
+
+    The facade only reads (and reassigns ``session_id`` on) plain attributes,
+    so a namespace is enough and avoids building a MagicMock per call.
+    """
+    return SimpleNamespace(
+        session_id=session_id,
+        cost=0.0,
+        duration_ms=100,
+        num_turns=1,
+        tools_used=[],
+        is_error=False,
+        content="ok",
+    )
+
+
+def _returning(response: Any) -> Callable[..., Awaitable[Any]]:
+    """Build an ``_execute`` replacement that returns ``response``."""
+
+    async def _execute(*args: Any, **kwargs: Any) -> Any:
+        return response
+
+    return _execute
+
+
+def _raising(error: Exception) -> Callable[..., Awaitable[Any]]:
+    """Build an ``_execute`` replacement that raises ``error``."""
 
-def _make_mock_response(session_id: str = "new-session-id") -> MagicMock:
-    """Create a mock CodexResponse with sensible defaults."""
-    resp = MagicMock()
-    resp.session_id = session_id
-    resp.cost = 0.0
-    resp.duration_ms = 100
-    resp.num_turns = 1
-    resp.tools_used = []
-    resp.is_error = False
-    resp.content = "ok"
-    return resp
+    async def _execute(*args: Any, **kwargs: Any) -> Any:
+        raise error
+
+    return _execute
+
+
+@contextmanager
+def _swap_execute(
+    facade: CodexIntegration, impl: Callable[..., Awaitable[Any]]
+) -> Iterator[None]:
+    """Temporarily shadow ``facade._execute`` without building a mock."""
+    facade._execute = impl
+    try:
+        yield
+    finally:
+        del facade._execute
 
 
 def _make_user_data(force_new: bool = False) -> Dict[str, Any]:
@@ -40,18 +84,22 @@ class _MemorySessionStorage:
 
     def __init__(self):
         self.sessions: Dict[str, CodexSession] = {}
+        self._by_user: Dict[int, Set[str]] = defaultdict(set)
 
     async def save_session(self, session: CodexSession) -> None:
         self.sessions[session.session_id] = session
+        self._by_user[session.user_id].add(session.session_id)
 
     async def load_session(self, session_id: str) -> Optional[CodexSession]:
         return self.sessions.get(session_id)
 
     async def delete_session(self, session_id: str) -> None:
-        self.sessions.pop(session_id, None)
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self._by_user[session.user_id].discard(session_id)
 
     async def get_user_sessions(self, user_id: int) -> List[CodexSession]:
-        return [s for s in self.sessions.values() if s.user_id == user_id]
+        return [self.sessions[sid] for sid in self._by_user.get(user_id, ())]
 
     async def get_all_sessions(self) -> List[CodexSession]:
         return list(self.sessions.values())
@@ -79,9 +127,14 @@ def session_manager(config):
 @pytest.fixture
 def facade(config, session_manager):
     """Create facade with mocked SDK manager and tool authorizer."""
-    sdk_manager = MagicMock()
+    # Tests swap out _execute, so the SDK manager is only stored, never used.
+    sdk_manager = object()
+
+    async def _always_valid(*args: Any, **kwargs: Any):
+        return True, None
+
     tool_authorizer = MagicMock()
-    tool_authorizer.validate_tool_call = AsyncMock(return_value=(True, None))
+    tool_authorizer.validate_tool_call = _always_valid
     tool_authorizer.get_tool_stats = MagicMock(return_value={})
     tool_authorizer.get_user_tool_usage = MagicMock(return_value={})
 
@@ -99,37 +152,31 @@ class TestForceNewSkipsAutoResume:
 
     async def test_auto_resume_finds_existing_session(self, facade, session_manager):
         """Without force_new, run_command auto-resumes an existing session."""
-        project = Path("/test/project")
-        user_id = 123
-
         # Seed an existing non-temp session in storage
         existing = CodexSession(
             session_id="real-session-id",
-            user_id=user_id,
-            project_path=project,
-            created_at=datetime.utcnow(),
-            last_used=datetime.utcnow(),
+            user_id=_USER_ID,
+            project_path=_PROJECT,
+            created_at=_NOW,
+            last_used=_NOW,
         )
         await session_manager.storage.save_session(existing)
         session_manager.active_sessions[existing.session_id] = existing
 
         # _find_resumable_session should find it
-        found = await facade._find_resumable_session(user_id, project)
+        found = await facade._find_resumable_session(_USER_ID, _PROJECT)
         assert found is not None
         assert found.session_id == "real-session-id"
 
     async def test_force_new_skips_auto_resume(self, facade, session_manager):
         """With force_new=True, run_command does NOT auto-resume."""
-        project = Path("/test/project")
-        user_id = 123
-
         # Seed an existing non-temp session
         existing = CodexSession(
             session_id="real-session-id",
-            user_id=user_id,
-            project_path=project,
-            created_at=datetime.utcnow(),
-            last_used=datetime.utcnow(),
+            user_id=_USER_ID,
+            project_path=_PROJECT,
+            created_at=_NOW,
+            last_used=_NOW,
         )
         await session_manager.storage.save_session(existing)
         session_manager.active_sessions[existing.session_id] = existing
@@ -138,15 +185,11 @@ class TestForceNewSkipsAutoResume:
         with patch.object(
             facade, "_find_resumable_session", wraps=facade._find_resumable_session
         ) as spy:
-            with patch.object(
-                facade,
-                "_execute",
-                return_value=_make_mock_response(),
-            ):
+            with _swap_execute(facade, _returning(_make_mock_response())):
                 await facade.run_command(
                     prompt="hello",
-                    working_directory=project,
-                    user_id=user_id,
+                    working_directory=_PROJECT,
+                    user_id=_USER_ID,
                     session_id=None,
                     force_new=True,
                 )
@@ -159,18 +202,15 @@ class TestForceNewSurvivesFailure:
     """Verify the handler-level contract: force_new_session flag stays set
     when run_command fails, so the next retry still starts a fresh session."""
 
-    async def _seed_session(
-        self,
-        session_manager: SessionManager,
-        user_id: int = 123,
-        project: Path = Path("/test/project"),
-    ) -> CodexSession:
+    @pytest.fixture(autouse=True)
+    async def existing_session(self, session_manager: SessionManager) -> CodexSession:
+        """Seed a resumable session that force_new must ignore."""
         existing = CodexSession(
             session_id="old-session-id",
-            user_id=user_id,
-            project_path=project,
-            created_at=datetime.utcnow(),
-            last_used=datetime.utcnow(),
+            user_id=_USER_ID,
+            project_path=_PROJECT,
+            created_at=_NOW,
+            last_used=_NOW,
         )
         await session_manager.storage.save_session(existing)
         session_manager.active_sessions[existing.session_id] = existing
@@ -179,9 +219,6 @@ class TestForceNewSurvivesFailure:
     async def test_flag_survives_run_command_failure(self, facade, session_manager):
         """If run_command raises, the caller should still see
         force_new_session=True so the retry skips auto-resume."""
-        project = Path("/test/project")
-        user_id = 123
-        await self._seed_session(session_manager, user_id, project)
 
         user_data = _make_user_data(force_new=True)
 
@@ -189,16 +226,12 @@ class TestForceNewSurvivesFailure:
         force_new = bool(user_data.get("force_new_session"))
         assert force_new is True
 
-        with patch.object(
-            facade,
-            "_execute",
-            side_effect=RuntimeError("network timeout"),
-        ):
+        with _swap_execute(facade, _raising(RuntimeError("network timeout"))):
             with pytest.raises(RuntimeError, match="network timeout"):
                 await facade.run_command(
                     prompt="hello",
-                    working_directory=project,
-                    user_id=user_id,
+                    working_directory=_PROJECT,
+                    user_id=_USER_ID,
                     session_id=None,
                     force_new=force_new,
                 )
@@ -210,22 +243,15 @@ class TestForceNewSurvivesFailure:
     async def test_flag_cleared_after_successful_run(self, facade, session_manager):
         """After a successful run_command, the handler clears
         force_new_session so subsequent messages auto-resume normally."""
-        project = Path("/test/project")
-        user_id = 123
-        await self._seed_session(session_manager, user_id, project)
 
         user_data = _make_user_data(force_new=True)
         force_new = bool(user_data.get("force_new_session"))
 
-        with patch.object(
-            facade,
-            "_execute",
-            return_value=_make_mock_response(),
-        ):
+        with _swap_execute(facade, _returning(_make_mock_response())):
             await facade.run_command(
                 prompt="hello",
-                working_directory=project,
-                user_id=user_id,
+                working_directory=_PROJECT,
+                user_id=_USER_ID,
                 session_id=None,
                 force_new=force_new,
             )
@@ -241,9 +267,6 @@ class TestForceNewSurvivesFailure:
     ):
         """Full scenario: /new -> fail -> retry -> success.
         Both calls should skip auto-resume; flag cleared only after success."""
-        project = Path("/test/project")
-        user_id = 123
-        await self._seed_session(session_manager, user_id, project)
 
         user_data = _make_user_data(force_new=True)
 
@@ -252,16 +275,12 @@ class TestForceNewSurvivesFailure:
         with patch.object(
             facade, "_find_resumable_session", wraps=facade._find_resumable_session
         ) as spy1:
-            with patch.object(
-                facade,
-                "_execute",
-                side_effect=RuntimeError("backend down"),
-            ):
+            with _swap_execute(facade, _raising(RuntimeError("backend down"))):
                 with pytest.raises(RuntimeError):
                     await facade.run_command(
                         prompt="hello",
-                        working_directory=project,
-                        user_id=user_id,
+                        working_directory=_PROJECT,
+                        user_id=_USER_ID,
                         session_id=None,
                         force_new=force_new,
                     )
@@ -275,15 +294,11 @@ class TestForceNewSurvivesFailure:
         with patch.object(
             facade, "_find_resumable_session", wraps=facade._find_resumable_session
         ) as spy2:
-            with patch.object(
-                facade,
-                "_execute",
-                return_value=_make_mock_response(),
-            ):
+            with _swap_execute(facade, _returning(_make_mock_response())):
                 await facade.run_command(
                     prompt="hello",
-                    working_directory=project,
-                    user_id=user_id,
+                    working_directory=_PROJECT,
+                    user_id=_USER_ID,
                     session_id=None,
                     force_new=force_new,
                 )
@@ -300,20 +315,15 @@ class TestEmptySessionIdWarning:
 
     async def test_empty_session_id_warning_in_facade(self, facade, session_manager):
         """When Codex returns no session_id, facade logs a warning."""
-        project = Path("/test/project")
         user_id = 456
 
         # Return a response with empty session_id
         mock_response = _make_mock_response(session_id="")
 
-        with patch.object(
-            facade,
-            "_execute",
-            return_value=mock_response,
-        ):
+        with _swap_execute(facade, _returning(mock_response)):
             result = await facade.run_command(
                 prompt="hello",
-                working_directory=project,
+                working_directory=_PROJECT,
                 user_id=user_id,
                 session_id=None,
             )
@@ -326,38 +336,45 @@ class TestResumeFallback:
     """Verify resume failures can fallback to a fresh session."""
 
     async def test_resume_status1_retries_as_fresh(self, facade, session_manager):
-        project = Path("/test/project")
         user_id = 789
 
         existing = CodexSession(
             session_id="resume-session-id",
             user_id=user_id,
-            project_path=project,
-            created_at=datetime.utcnow(),
-            last_used=datetime.utcnow(),
+            project_path=_PROJECT,
+            created_at=_NOW,
+            last_used=_NOW,
         )
         await session_manager.storage.save_session(existing)
         session_manager.active_sessions[existing.session_id] = existing
 
-        first_error = CodexProcessError("Codex process error: Codex CLI exited with status 1")
+        first_error = CodexProcessError(
+            "Codex process error: Codex CLI exited with status 1"
+        )
         second_response = _make_mock_response(session_id="fresh-session-id")
 
-        with patch.object(
-            facade,
-            "_execute",
-            side_effect=[first_error, second_response],
-        ) as exec_spy:
+        outcomes = iter([first_error, second_response])
+        calls: List[Dict[str, Any]] = []
+
+        async def _execute(**kwargs: Any) -> Any:
+            calls.append(kwargs)
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with _swap_execute(facade, _execute):
             result = await facade.run_command(
                 prompt="hello",
-                working_directory=project,
+                working_directory=_PROJECT,
                 user_id=user_id,
                 session_id="resume-session-id",
                 force_new=False,
             )
 
-        assert exec_spy.call_count == 2
-        first_call = exec_spy.call_args_list[0].kwargs
-        second_call = exec_spy.call_args_list[1].kwargs
-        assert first_call["continue_session"] is True
-        assert second_call["continue_session"] is False
+        assert len(calls) == 2
+        assert calls[0]["continue_session"] is True
+        assert calls[1]["continue_session"] is False
+        # No on_stream consumer, so no stream callback reaches the SDK layer
+        assert calls[0]["stream_callback"] is None
         assert result.session_id == "fresh-session-id"
@@ -2,33 +2,45 @@
 
 import asyncio
 import json
+import os
+import sys
+from collections import deque
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
 from unittest.mock import patch
 
 import pytest
 
+from src.codex import sdk_integration
 from src.codex.exceptions import (
+    CodexMCPError,
     CodexProcessError,
     CodexTimeoutError,
     CodexToolValidationError,
 )
-from src.codex.sdk_integration import CodexResponse, CodexSDKManager, StreamUpdate
+from src.codex.sdk_integration import (
+    CodexResponse,
+    CodexSDKManager,
+    StreamUpdate,
+    _grow_pipe,
+    _grow_stdout_pipe,
+    _iter_lines,
+)
 from src.config.settings import Settings
 
 
 class _Stream:
-    """Async readline stream backed by a list of byte lines."""
+    """Async pipe stream that hands out one queued byte chunk per read."""
 
-    def __init__(self, lines=None, delay: float = 0.0):
-        self._lines = list(lines or [])
+    def __init__(self, chunks=None, delay: float = 0.0):
+        self._chunks = deque(chunks or ())
         self._delay = delay
 
-    async def readline(self) -> bytes:
+    async def read(self, n: int = -1) -> bytes:
         if self._delay:
             await asyncio.sleep(self._delay)
-        if not self._lines:
-            return b""
-        return self._lines.pop(0)
+        return self._chunks.popleft() if self._chunks else b""
 
 
 class _MockProcess:
@@ -46,6 +58,23 @@ class _MockProcess:
         self.returncode = -9
 
 
+class _Spawner:
+    """Stand-in for ``asyncio.create_subprocess_exec``.
+
+    Hands out ``process`` and records the argv/kwargs it was called with.
+    """
+
+    def __init__(self) -> None:
+        self.process = _MockProcess()
+        self.cmd: Tuple[str, ...] = ()
+        self.kwargs: Dict[str, Any] = {}
+
+    async def __call__(self, *cmd: str, **kwargs: Any) -> _MockProcess:
+        self.cmd = cmd
+        self.kwargs = kwargs
+        return self.process
+
+
 @pytest.fixture
 def config(tmp_path: Path) -> Settings:
     return Settings(
@@ -64,29 +93,34 @@ def manager(config: Settings) -> CodexSDKManager:
         return CodexSDKManager(config)
 
 
-class TestCodexSDKManager:
-    async def test_execute_command_success(self, manager: CodexSDKManager):
-        called_cmd = []
+@pytest.fixture
+def spawner() -> _Spawner:
+    spawner = _Spawner()
+    with patch("src.codex.sdk_integration.asyncio.create_subprocess_exec", new=spawner):
+        yield spawner
 
-        async def _create_process(*cmd, **kwargs):
-            called_cmd.extend(list(cmd))
-            stdout_lines = [
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestCodexSDKManager:
+    async def test_execute_command_success(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[
                 b'{"type":"thread.started","thread_id":"thread-123"}\n',
                 b'{"type":"turn.started"}\n',
                 b'{"type":"response.output_text.delta","delta":"hello"}\n',
                 b'{"type":"exec.command.started","command":"ls -la"}\n',
-            ]
-            return _MockProcess(stdout_lines=stdout_lines, returncode=0)
+            ],
+            returncode=0,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            response = await manager.execute_command(
-                prompt="say hello",
-                working_directory=Path("/tmp"),
-            )
+        response = await manager.execute_command(
+            prompt="say hello",
+            working_directory=Path("/tmp"),
+        )
 
+        called_cmd = spawner.cmd
         assert isinstance(response, CodexResponse)
         assert response.session_id == "thread-123"
         assert "--output-last-message" not in called_cmd
@@ -98,40 +132,130 @@ class TestCodexSDKManager:
         assert response.cost == 0.0
         assert any(tool.get("name") == "Bash" for tool in response.tools_used)
 
-    async def test_execute_command_resume_session(self, manager: CodexSDKManager):
-        called_cmd = []
+    async def test_execute_command_frames_lines_across_read_chunks(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[
+                b'{"type":"thread.started","thread_id":"thr',
+                b'ead-split"}\n{"type":"turn.started"}\n{"type":"response.',
+                b'output_text.delta","delta":"joined"}',
+            ],
+            stderr_lines=[b"first warn", b"ing\nsecond warning\n"],
+            returncode=0,
+        )
 
-        async def _create_process(*cmd, **kwargs):
-            cmd_list = list(cmd)
-            called_cmd.extend(cmd_list)
+        response = await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
 
-            return _MockProcess(
-                stdout_lines=[
-                    b'{"type":"turn.started"}\n',
-                    b'{"type":"response.output_text.delta","delta":"continued"}\n',
-                ],
-                returncode=0,
+        assert response.session_id == "thread-split"
+        assert response.num_turns == 1
+        assert response.content == "joined"
+
+    async def test_execute_command_skips_oversized_lines(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        oversized = b'{"type":"response.output_text.delta","delta":"' + b"x" * 80
+        spawner.process = _MockProcess(
+            stdout_lines=[
+                b'{"type":"thread.started","thread_id":"thread-big"}\n',
+                # Overruns the limit before its newline arrives.
+                oversized[:100],
+                oversized[100:] + b'"}\n{"type":"response.output_text.delta",',
+                # Overruns the limit within a single read.
+                b'"delta":"kept"}\n' + oversized + b'"}\n',
+                # Unterminated and oversized at EOF.
+                b"no newline " * 10,
+            ],
+            returncode=0,
+        )
+
+        with patch("src.codex.sdk_integration._STREAM_LIMIT", 64):
+            response = await manager.execute_command(
+                prompt="hello",
+                working_directory=Path("/tmp"),
             )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
+        assert response.session_id == "thread-big"
+        assert response.content == "kept"
+
+    async def test_execute_command_parses_events_without_orjson(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[
+                b'{"type":"thread.started","thread_id":"thread-json"}\n',
+                b"not json at all\n",
+                b'{"type":"response.output_text.delta","delta":"stdlib"}\n',
+                b"{broken\n",
+            ],
+            returncode=0,
+        )
+
+        with patch("src.codex.sdk_integration._decode_event", json.loads):
+            response = await manager.execute_command(
+                prompt="hello",
+                working_directory=Path("/tmp"),
+            )
+
+        assert response.session_id == "thread-json"
+        assert response.content == "stdlib"
+
+    @pytest.mark.parametrize(
+        "decoder",
+        [
+            pytest.param(sdk_integration._decode_event, id="default-decoder"),
+            pytest.param(json.loads, id="stdlib-decoder"),
+        ],
+    )
+    async def test_execute_command_keeps_events_with_invalid_utf8(
+        self, manager: CodexSDKManager, spawner: _Spawner, decoder
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[
+                b'{"type":"thread.started","thread_id":"thread-utf8"}\n',
+                b'{"type":"response.output_text.delta","delta":"cut \xe2\x82"}\n',
+            ],
+            returncode=0,
+        )
+
+        with patch("src.codex.sdk_integration._decode_event", decoder):
             response = await manager.execute_command(
-                prompt="continue",
+                prompt="hello",
                 working_directory=Path("/tmp"),
-                session_id="thread-existing",
-                continue_session=True,
             )
 
+        assert response.session_id == "thread-utf8"
+        assert response.content == "cut \ufffd"
+
+    async def test_execute_command_resume_session(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[
+                b'{"type":"turn.started"}\n',
+                b'{"type":"response.output_text.delta","delta":"continued"}\n',
+            ],
+            returncode=0,
+        )
+
+        response = await manager.execute_command(
+            prompt="continue",
+            working_directory=Path("/tmp"),
+            session_id="thread-existing",
+            continue_session=True,
+        )
+
         # codex exec resume --json --skip-git-repo-check <session_id>
-        assert called_cmd[0:3] == ["/usr/bin/codex", "exec", "resume"]
+        called_cmd = spawner.cmd
+        assert called_cmd[0:3] == ("/usr/bin/codex", "exec", "resume")
         assert "--json" in called_cmd
         assert "--skip-git-repo-check" in called_cmd
-        assert called_cmd.index("--json") < called_cmd.index("thread-existing")
-        assert called_cmd.index("--skip-git-repo-check") < called_cmd.index(
-            "thread-existing"
-        )
+        session_pos = called_cmd.index("thread-existing")
+        assert called_cmd.index("--json") < session_pos
+        assert called_cmd.index("--skip-git-repo-check") < session_pos
         assert "--yolo" in called_cmd
         assert "--sandbox" not in called_cmd
         assert "--output-last-message" not in called_cmd
@@ -139,192 +263,155 @@ class TestCodexSDKManager:
         assert response.content == "continued"
 
     async def test_execute_command_extracts_completed_response_text(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            payload = {
-                "type": "response.completed",
-                "response": {
-                    "output": [
-                        {
-                            "type": "message",
-                            "role": "assistant",
-                            "content": [
-                                {
-                                    "type": "output_text",
-                                    "text": "I can see repositories in this directory.",
-                                }
-                            ],
-                        }
-                    ]
-                },
-            }
-            stdout_lines = [json.dumps(payload).encode("utf-8") + b"\n"]
-            return _MockProcess(stdout_lines=stdout_lines, returncode=0)
-
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            response = await manager.execute_command(
-                prompt="can you see repos?",
-                working_directory=Path("/tmp"),
-            )
+        payload = {
+            "type": "response.completed",
+            "response": {
+                "output": [
+                    {
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [
+                            {
+                                "type": "output_text",
+                                "text": "I can see repositories in this directory.",
+                            }
+                        ],
+                    }
+                ]
+            },
+        }
+        spawner.process = _MockProcess(
+            stdout_lines=[json.dumps(payload).encode("utf-8") + b"\n"],
+            returncode=0,
+        )
+
+        response = await manager.execute_command(
+            prompt="can you see repos?",
+            working_directory=Path("/tmp"),
+        )
 
         assert response.content == "I can see repositories in this directory."
 
     async def test_execute_command_resume_strips_sandbox_extra_args(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
         manager.config.codex_extra_args = ["--sandbox", "workspace-write", "--search"]
-        called_cmd = []
-
-        async def _create_process(*cmd, **kwargs):
-            cmd_list = list(cmd)
-            called_cmd.extend(cmd_list)
-
-            return _MockProcess(
-                stdout_lines=[
-                    b'{"type":"turn.started"}\n',
-                    b'{"type":"response.output_text.delta","delta":"continued"}\n',
-                ],
-                returncode=0,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[
+                b'{"type":"turn.started"}\n',
+                b'{"type":"response.output_text.delta","delta":"continued"}\n',
+            ],
+            returncode=0,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            await manager.execute_command(
-                prompt="continue",
-                working_directory=Path("/tmp"),
-                session_id="thread-existing",
-                continue_session=True,
-            )
+        await manager.execute_command(
+            prompt="continue",
+            working_directory=Path("/tmp"),
+            session_id="thread-existing",
+            continue_session=True,
+        )
 
-        assert "--sandbox" not in called_cmd
-        assert "--search" in called_cmd
-        assert "--output-last-message" not in called_cmd
+        assert "--sandbox" not in spawner.cmd
+        assert "--search" in spawner.cmd
+        assert "--output-last-message" not in spawner.cmd
 
     async def test_execute_command_can_disable_yolo_and_use_workspace_sandbox(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
         manager.config.codex_yolo = False
         manager.config.sandbox_enabled = True
-        called_cmd = []
-
-        async def _create_process(*cmd, **kwargs):
-            called_cmd.extend(list(cmd))
-            return _MockProcess(
-                stdout_lines=[b'{"type":"response.output_text.delta","delta":"ok"}\n'],
-                returncode=0,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"response.output_text.delta","delta":"ok"}\n'],
+            returncode=0,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            await manager.execute_command(
-                prompt="hello",
-                working_directory=Path("/tmp"),
-            )
+        await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
 
-        assert "--yolo" not in called_cmd
-        assert "--sandbox" in called_cmd
-        assert "workspace-write" in called_cmd
+        assert "--yolo" not in spawner.cmd
+        assert "--sandbox" in spawner.cmd
+        assert "workspace-write" in spawner.cmd
 
     async def test_execute_command_deduplicates_yolo_alias_from_extra_args(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
         manager.config.codex_extra_args = [
             "--yolo",
             "--dangerously-bypass-approvals-and-sandbox",
             "--search",
         ]
-        called_cmd = []
-
-        async def _create_process(*cmd, **kwargs):
-            called_cmd.extend(list(cmd))
-            return _MockProcess(
-                stdout_lines=[b'{"type":"response.output_text.delta","delta":"ok"}\n'],
-                returncode=0,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"response.output_text.delta","delta":"ok"}\n'],
+            returncode=0,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            await manager.execute_command(
-                prompt="hello",
-                working_directory=Path("/tmp"),
-            )
+        await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
 
         yolo_aliases = {"--yolo", "--dangerously-bypass-approvals-and-sandbox"}
-        assert sum(1 for arg in called_cmd if arg in yolo_aliases) == 1
-        assert "--search" in called_cmd
+        assert sum(1 for arg in spawner.cmd if arg in yolo_aliases) == 1
+        assert "--search" in spawner.cmd
 
     async def test_execute_command_applies_max_budget_config(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
         manager.config.codex_max_budget_usd = 0.25
-        called_cmd = []
-
-        async def _create_process(*cmd, **kwargs):
-            called_cmd.extend(list(cmd))
-            return _MockProcess(
-                stdout_lines=[b'{"type":"response.output_text.delta","delta":"ok"}\n'],
-                returncode=0,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"response.output_text.delta","delta":"ok"}\n'],
+            returncode=0,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            await manager.execute_command(
-                prompt="hello",
-                working_directory=Path("/tmp"),
-            )
+        await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
 
-        assert "-c" in called_cmd
-        assert "max_budget_usd=0.25" in called_cmd
+        assert "-c" in spawner.cmd
+        assert "max_budget_usd=0.25" in spawner.cmd
 
-    async def test_execute_command_stream_callback(self, manager: CodexSDKManager):
+    async def test_execute_command_stream_callback(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
         updates = []
 
         async def _stream_callback(update: StreamUpdate):
             updates.append(update)
 
-        async def _create_process(*cmd, **kwargs):
-            stdout_lines = [
+        spawner.process = _MockProcess(
+            stdout_lines=[
                 b'{"type":"thread.started","thread_id":"thread-abc"}\n',
                 b'{"type":"response.output_text.delta","delta":"partial"}\n',
                 b'{"type":"exec.command.started","command":"pytest -q"}\n',
-            ]
-            return _MockProcess(stdout_lines=stdout_lines, returncode=0)
+            ],
+            returncode=0,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            await manager.execute_command(
-                prompt="run tests",
-                working_directory=Path("/tmp"),
-                stream_callback=_stream_callback,
-            )
+        await manager.execute_command(
+            prompt="run tests",
+            working_directory=Path("/tmp"),
+            stream_callback=_stream_callback,
+        )
 
         assert any(update.content == "partial" for update in updates)
         assert any(update.tool_calls for update in updates)
 
     async def test_execute_command_blocks_tool_with_can_use_tool_callback(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            stdout_lines = [
+        spawner.process = _MockProcess(
+            stdout_lines=[
                 b'{"type":"thread.started","thread_id":"thread-abc"}\n',
                 b'{"type":"turn.started"}\n',
                 b'{"type":"exec.command.started","command":"rm -rf /tmp/demo"}\n',
-            ]
-            return _MockProcess(stdout_lines=stdout_lines, returncode=0)
+            ],
+            returncode=0,
+        )
 
         callback_calls = []
 
@@ -332,188 +419,167 @@ class TestCodexSDKManager:
             callback_calls.append((tool_name, tool_input))
             return False, "Tool policy blocked this operation."
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            with pytest.raises(CodexToolValidationError) as exc_info:
-                await manager.execute_command(
-                    prompt="delete temp dir",
-                    working_directory=Path("/tmp"),
-                    can_use_tool=_deny_bash,
-                )
+        with pytest.raises(CodexToolValidationError) as exc_info:
+            await manager.execute_command(
+                prompt="delete temp dir",
+                working_directory=Path("/tmp"),
+                can_use_tool=_deny_bash,
+            )
 
         assert "tool policy blocked" in str(exc_info.value).lower()
         assert callback_calls
         assert callback_calls[0][0] == "Bash"
 
-    async def test_execute_command_not_logged_in_error(self, manager: CodexSDKManager):
-        async def _create_process(*cmd, **kwargs):
-            return _MockProcess(
-                stdout_lines=[],
-                stderr_lines=[b"Not logged in\n"],
-                returncode=1,
-            )
+    async def test_execute_command_not_logged_in_error(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[],
+            stderr_lines=[b"Not logged in\n"],
+            returncode=1,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            with pytest.raises(CodexProcessError) as exc_info:
-                await manager.execute_command(
-                    prompt="hello",
-                    working_directory=Path("/tmp"),
-                )
+        with pytest.raises(CodexProcessError) as exc_info:
+            await manager.execute_command(
+                prompt="hello",
+                working_directory=Path("/tmp"),
+            )
 
         assert "not logged in" in str(exc_info.value).lower()
 
-    async def test_execute_command_no_last_message_warning_is_nonfatal(
-        self, manager: CodexSDKManager
+    async def test_execute_command_mcp_error(
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            return _MockProcess(
-                stdout_lines=[
-                    b'{"type":"response.output_text.delta","delta":"partial"}\n'
-                ],
-                stderr_lines=[
-                    b"Warning: no last agent message; wrote empty content to /tmp/out.txt\n"
-                ],
-                returncode=1,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[],
+            stderr_lines=[b"MCP server 'docs' failed to start\n"],
+            returncode=1,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            response = await manager.execute_command(
+        with pytest.raises(CodexMCPError) as exc_info:
+            await manager.execute_command(
                 prompt="hello",
                 working_directory=Path("/tmp"),
             )
 
+        assert "failed to start" in str(exc_info.value)
+
+    async def test_execute_command_no_last_message_warning_is_nonfatal(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"response.output_text.delta","delta":"partial"}\n'],
+            stderr_lines=[
+                b"Warning: no last agent message; wrote empty content to /tmp/out.txt\n"
+            ],
+            returncode=1,
+        )
+
+        response = await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
+
         assert response.content == "partial"
 
     async def test_nonzero_exit_with_assistant_content_is_nonfatal(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            return _MockProcess(
-                stdout_lines=[
-                    b'{"type":"response.output_text.delta","delta":"hello"}\n'
-                ],
-                stderr_lines=[b"internal warning\n"],
-                returncode=1,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"response.output_text.delta","delta":"hello"}\n'],
+            stderr_lines=[b"internal warning\n"],
+            returncode=1,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            response = await manager.execute_command(
-                prompt="hello",
-                working_directory=Path("/tmp"),
-            )
+        response = await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
 
         assert response.content == "hello"
 
     async def test_warning_no_last_message_without_output_does_not_set_new_session(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            return _MockProcess(
-                stdout_lines=[b'{"type":"thread.started","thread_id":"new-thread"}\n'],
-                stderr_lines=[
-                    b"Warning: no last agent message; wrote empty content to /tmp/out.txt\n"
-                ],
-                returncode=1,
-            )
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"thread.started","thread_id":"new-thread"}\n'],
+            stderr_lines=[
+                b"Warning: no last agent message; wrote empty content to /tmp/out.txt\n"
+            ],
+            returncode=1,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            response = await manager.execute_command(
-                prompt="hello",
-                working_directory=Path("/tmp"),
-            )
+        response = await manager.execute_command(
+            prompt="hello",
+            working_directory=Path("/tmp"),
+        )
 
         assert response.content.startswith("I could not produce a final response")
         assert response.session_id == ""
 
     async def test_error_event_message_is_propagated_on_nonzero_exit(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            stdout_lines = [
+        spawner.process = _MockProcess(
+            stdout_lines=[
                 b'{"type":"turn.started"}\n',
                 b'{"type":"error","error":{"message":"Approval required for tool execution"}}\n',
                 b'{"type":"turn.failed"}\n',
-            ]
-            return _MockProcess(stdout_lines=stdout_lines, returncode=1)
-
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            with pytest.raises(CodexProcessError) as exc_info:
-                await manager.execute_command(
-                    prompt="hello",
-                    working_directory=Path("/tmp"),
-                )
+            ],
+            returncode=1,
+        )
+
+        with pytest.raises(CodexProcessError) as exc_info:
+            await manager.execute_command(
+                prompt="hello",
+                working_directory=Path("/tmp"),
+            )
 
         assert "approval required" in str(exc_info.value).lower()
 
     async def test_event_error_takes_precedence_over_stderr_on_nonzero_exit(
-        self, manager: CodexSDKManager
+        self, manager: CodexSDKManager, spawner: _Spawner
     ):
-        async def _create_process(*cmd, **kwargs):
-            stdout_lines = [
+        spawner.process = _MockProcess(
+            stdout_lines=[
                 b'{"type":"turn.started"}\n',
                 b'{"type":"error","error":{"message":"unexpected status 401 Unauthorized: Missing bearer or basic authentication in header"}}\n',
                 b'{"type":"turn.failed"}\n',
-            ]
-            stderr_lines = [b"WARN codex_core::state_db: record_discrepancy\n"]
-            return _MockProcess(
-                stdout_lines=stdout_lines,
-                stderr_lines=stderr_lines,
-                returncode=1,
-            )
+            ],
+            stderr_lines=[b"WARN codex_core::state_db: record_discrepancy\n"],
+            returncode=1,
+        )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            with pytest.raises(CodexProcessError) as exc_info:
-                await manager.execute_command(
-                    prompt="hello",
-                    working_directory=Path("/tmp"),
-                )
+        with pytest.raises(CodexProcessError) as exc_info:
+            await manager.execute_command(
+                prompt="hello",
+                working_directory=Path("/tmp"),
+            )
 
         error_message = str(exc_info.value).lower()
         assert "401 unauthorized" in error_message
         assert "missing bearer" in error_message
 
-    async def test_execute_command_timeout(self, manager: CodexSDKManager):
+    async def test_execute_command_timeout(
+        self, manager: CodexSDKManager, spawner: _Spawner
+    ):
         # Make timeout short so test stays fast.
         manager.config.codex_timeout_seconds = 1
+        spawner.process = _MockProcess(
+            stdout_lines=[b'{"type":"turn.started"}\n'],
+            stderr_lines=[],
+            returncode=0,
+            delay=5.0,
+        )
 
-        async def _create_process(*cmd, **kwargs):
-            return _MockProcess(
-                stdout_lines=[b'{"type":"turn.started"}\n'],
-                stderr_lines=[],
-                returncode=0,
-                delay=5.0,
+        with pytest.raises(CodexTimeoutError):
+            await manager.execute_command(
+                prompt="slow request",
+                working_directory=Path("/tmp"),
             )
 
-        with patch(
-            "src.codex.sdk_integration.asyncio.create_subprocess_exec",
-            side_effect=_create_process,
-        ):
-            with pytest.raises(CodexTimeoutError):
-                await manager.execute_command(
-                    prompt="slow request",
-                    working_directory=Path("/tmp"),
-                )
 
+class TestCodexSDKManagerHelpers:
     def test_get_active_process_count(self, manager: CodexSDKManager):
         assert manager.get_active_process_count() == 0
 
@@ -538,3 +604,83 @@ class TestCodexSDKManager:
         manager.config.codex_home = tmp_path / "codex-home"
         env = manager._build_environment()
         assert env["CODEX_HOME"] == str((tmp_path / "codex-home").expanduser())
+
+    def test_build_codex_command_follows_config_changes(self, manager: CodexSDKManager):
+        first = manager._build_codex_command("hi", None, False)
+        assert "--yolo" in first
+
+        manager.config.codex_yolo = False
+        manager.config.codex_model = "gpt-5-codex"
+        second = manager._build_codex_command("hi", None, False)
+
+        assert "--yolo" not in second
+        assert second[second.index("--model") + 1] == "gpt-5-codex"
+        assert manager._build_codex_command("hi", None, False) == second
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="F_SETPIPE_SZ is Linux-only")
+    def test_grow_pipe_enlarges_real_pipe(self):
+        import fcntl
+
+        read_fd, write_fd = os.pipe()
+        try:
+            _grow_pipe(read_fd)
+            assert fcntl.fcntl(read_fd, fcntl.F_GETPIPE_SZ) >= 1024 * 1024
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="F_SETPIPE_SZ is Linux-only")
+    @pytest.mark.parametrize(
+        "transport",
+        [
+            pytest.param(SimpleNamespace(), id="no-get_pipe_transport"),
+            pytest.param(
+                SimpleNamespace(
+                    get_pipe_transport=lambda fd: SimpleNamespace(
+                        get_extra_info=lambda key: None, fileno=lambda: -1
+                    )
+                ),
+                id="closed-fd",
+            ),
+        ],
+    )
+    def test_grow_stdout_pipe_ignores_unexpected_transports(self, transport):
+        _grow_stdout_pipe(SimpleNamespace(_transport=transport))
+
+    def test_grow_stdout_pipe_reaches_subprocess_pipe(self, loop_runner):
+        # The child reports the capacity of its stdout pipe after the parent
+        # has resized it (both ends share one kernel pipe), or "socket" when
+        # the loop connected stdout through a socketpair, as uvloop does.
+        async def spawn_and_grow() -> bytes:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                "import fcntl, os, stat, sys; sys.stdin.read(); "
+                "print(fcntl.fcntl(1, fcntl.F_GETPIPE_SZ) "
+                "if stat.S_ISFIFO(os.fstat(1).st_mode) else 'socket')",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+            )
+            _grow_stdout_pipe(process)
+            process.stdin.close()
+            stdout, _ = await process.communicate()
+            return stdout.strip()
+
+        reported = loop_runner.run(spawn_and_grow())
+
+        if reported != b"socket":
+            assert int(reported) >= 1024 * 1024
+
+    def test_iter_lines_frames_real_subprocess_output(self, loop_runner):
+        async def read_lines() -> List[bytes]:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                "import sys; sys.stdout.write('one\\n' + 'x' * 200000 + '\\nlast')",
+                stdout=asyncio.subprocess.PIPE,
+            )
+            lines = [line async for line in _iter_lines(process.stdout)]
+            await process.wait()
+            return lines
+
+        assert loop_runner.run(read_lines()) == [b"one", b"x" * 200000, b"last"]
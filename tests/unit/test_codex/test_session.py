@@ -1,31 +1,67 @@
 """Test Codex session management."""
 
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, replace
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pytest
+import pytest_asyncio
 
 from src.codex.sdk_integration import CodexResponse
 from src.codex.session import CodexSession, SessionManager
 from src.codex.tool_authorizer import DefaultToolAuthorizer
 from src.config.settings import Settings
 
+# One timestamp for every session built here. Captured at import rather than
+# fixed, so sessions stamped with it are never past the expiry window.
+_NOW = datetime.now(UTC)
 
+_PATH = Path("/test/path")
+_PROJECT = Path("/test/project")
+_TMP = Path("/tmp")
+
+_TEMPLATE_SESSION = CodexSession(
+    session_id="test-session",
+    user_id=123,
+    project_path=_PATH,
+    created_at=_NOW,
+    last_used=_NOW,
+)
+
+_BASE_RESPONSE = CodexResponse(
+    content="Test response",
+    session_id="test-session",
+    cost=0.05,
+    duration_ms=1000,
+    num_turns=2,
+    tools_used=[{"name": "Read"}, {"name": "Write"}],
+)
+
+
+def _mk_session(**overrides) -> CodexSession:
+    """Return a copy of the template session with ``overrides`` applied."""
+    # replace() would otherwise hand every copy the template's tools list.
+    overrides.setdefault("tools_used", [])
+    return replace(_TEMPLATE_SESSION, **overrides)
+
+
+@dataclass(slots=True, frozen=True)
 class _MonitorConfigStub:
     """Minimal config object for ToolMonitor tests."""
 
-    def __init__(self, disable_tool_validation: bool):
-        self.disable_tool_validation = disable_tool_validation
-        self.codex_allowed_tools = ["Read"]
-        self.codex_disallowed_tools = ["Bash"]
+    disable_tool_validation: bool
+    codex_allowed_tools: Tuple[str, ...] = ("Read",)
+    codex_disallowed_tools: Tuple[str, ...] = ("Bash",)
 
 
+@dataclass(slots=True, frozen=True)
 class _ValidatorStub:
     """Minimal security validator stub for ToolMonitor tests."""
 
-    def __init__(self, should_allow_path: bool = True):
-        self.should_allow_path = should_allow_path
+    should_allow_path: bool = True
 
     def validate_path(self, file_path: str, working_directory: Path):
         if self.should_allow_path:
@@ -36,41 +72,85 @@ class _ValidatorStub:
 class _MemorySessionStorage:
     """Minimal in-memory storage used by SessionManager tests."""
 
+    __slots__ = ("sessions", "_by_user")
+
     def __init__(self):
         self.sessions: Dict[str, CodexSession] = {}
+        self._by_user: Dict[int, Dict[str, CodexSession]] = defaultdict(dict)
 
     async def save_session(self, session: CodexSession) -> None:
         self.sessions[session.session_id] = session
+        self._by_user[session.user_id][session.session_id] = session
 
     async def load_session(self, session_id: str) -> Optional[CodexSession]:
         return self.sessions.get(session_id)
 
     async def delete_session(self, session_id: str) -> None:
-        self.sessions.pop(session_id, None)
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self._by_user[session.user_id].pop(session_id, None)
 
     async def get_user_sessions(self, user_id: int) -> List[CodexSession]:
-        return [s for s in self.sessions.values() if s.user_id == user_id]
+        return list(self._by_user.get(user_id, {}).values())
 
     async def get_all_sessions(self) -> List[CodexSession]:
         return list(self.sessions.values())
 
 
+@pytest_asyncio.fixture(loop_scope="module", autouse=True)
+async def _no_leaked_tasks():
+    """Fail a test that leaves tasks behind on the shared module loop."""
+    yield
+    current = asyncio.current_task()
+    leaked = [t for t in asyncio.all_tasks() if t is not current and not t.done()]
+    assert not leaked, f"test leaked pending tasks: {leaked}"
+
+
+@pytest.fixture(scope="module")
+def bypass_monitor():
+    """Authorizer with tool validation disabled, shared by the module."""
+    return DefaultToolAuthorizer(_MonitorConfigStub(disable_tool_validation=True), None)
+
+
+@pytest.fixture(scope="module")
+def enforcing_monitor():
+    """Authorizer with tool validation enabled, shared by the module."""
+    return DefaultToolAuthorizer(
+        _MonitorConfigStub(disable_tool_validation=False), None
+    )
+
+
+@pytest.fixture(scope="module")
+def bypass_monitor_rejecting_paths():
+    """Validation-disabled authorizer whose path validator rejects everything."""
+    return DefaultToolAuthorizer(
+        _MonitorConfigStub(disable_tool_validation=True),
+        _ValidatorStub(should_allow_path=False),
+    )
+
+
+@pytest.fixture(scope="module")
+def config(tmp_path_factory):
+    """Create test config, shared by the module; no test mutates it."""
+    return Settings(
+        telegram_bot_token="test:token",
+        telegram_bot_username="testbot",
+        approved_directory=tmp_path_factory.mktemp("approved"),
+        session_timeout_hours=24,
+        max_sessions_per_user=2,
+    )
+
+
 class TestCodexSession:
     """Test CodexSession class."""
 
     def test_session_creation(self):
         """Test session creation."""
-        session = CodexSession(
-            session_id="test-session",
-            user_id=123,
-            project_path=Path("/test/path"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
-        )
+        session = _mk_session()
 
         assert session.session_id == "test-session"
         assert session.user_id == 123
-        assert session.project_path == Path("/test/path")
+        assert session.project_path == _PATH
         assert session.total_cost == 0.0
         assert session.total_turns == 0
         assert session.message_count == 0
@@ -78,16 +158,9 @@ class TestCodexSession:
 
     def test_session_expiry(self):
         """Test session expiry logic."""
-        now = datetime.now(UTC)
-        old_time = now - timedelta(hours=25)
+        old_time = _NOW - timedelta(hours=25)
 
-        session = CodexSession(
-            session_id="test-session",
-            user_id=123,
-            project_path=Path("/test/path"),
-            created_at=old_time,
-            last_used=old_time,
-        )
+        session = _mk_session(created_at=old_time, last_used=old_time)
 
         # Should be expired after 24 hours
         assert session.is_expired(24) is True
@@ -95,24 +168,9 @@ class TestCodexSession:
 
     def test_update_usage(self):
         """Test usage update."""
-        session = CodexSession(
-            session_id="test-session",
-            user_id=123,
-            project_path=Path("/test/path"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
-        )
-
-        response = CodexResponse(
-            content="Test response",
-            session_id="test-session",
-            cost=0.05,
-            duration_ms=1000,
-            num_turns=2,
-            tools_used=[{"name": "Read"}, {"name": "Write"}],
-        )
+        session = _mk_session()
 
-        session.update_usage(response)
+        session.update_usage(_BASE_RESPONSE)
 
         assert session.total_cost == 0.05
         assert session.total_turns == 2
@@ -122,12 +180,7 @@ class TestCodexSession:
 
     def test_to_dict_and_from_dict(self):
         """Test serialization/deserialization."""
-        original = CodexSession(
-            session_id="test-session",
-            user_id=123,
-            project_path=Path("/test/path"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
+        original = _mk_session(
             total_cost=0.05,
             total_turns=2,
             message_count=1,
@@ -170,18 +223,15 @@ class TestCodexSession:
     def test_is_expired_handles_legacy_naive_last_used(self):
         """Expiry check should not crash on naive legacy timestamps."""
         # Simulate legacy naive UTC timestamp persisted without tzinfo.
-        naive_old = datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=30)
-        session = CodexSession(
-            session_id="legacy-session",
-            user_id=123,
-            project_path=Path("/test/path"),
-            created_at=naive_old,
-            last_used=naive_old,
+        naive_old = _NOW.replace(tzinfo=None) - timedelta(hours=30)
+        session = _mk_session(
+            session_id="legacy-session", created_at=naive_old, last_used=naive_old
         )
 
         assert session.is_expired(24) is True
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestMemorySessionStorage:
     """Test in-memory session storage helper used by tests."""
 
@@ -193,13 +243,7 @@ class TestMemorySessionStorage:
     @pytest.fixture
     def sample_session(self):
         """Create sample session."""
-        return CodexSession(
-            session_id="test-session",
-            user_id=123,
-            project_path=Path("/test/path"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
-        )
+        return _mk_session()
 
     async def test_save_and_load_session(self, storage, sample_session):
         """Test saving and loading session."""
@@ -230,26 +274,10 @@ class TestMemorySessionStorage:
     async def test_get_user_sessions(self, storage):
         """Test getting user sessions."""
         # Create sessions for different users
-        session1 = CodexSession(
-            session_id="session1",
-            user_id=123,
-            project_path=Path("/test/path1"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
-        )
-        session2 = CodexSession(
-            session_id="session2",
-            user_id=123,
-            project_path=Path("/test/path2"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
-        )
-        session3 = CodexSession(
-            session_id="session3",
-            user_id=456,
-            project_path=Path("/test/path3"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
+        session1 = _mk_session(session_id="session1", project_path=Path("/test/path1"))
+        session2 = _mk_session(session_id="session2", project_path=Path("/test/path2"))
+        session3 = _mk_session(
+            session_id="session3", user_id=456, project_path=Path("/test/path3")
         )
 
         await storage.save_session(session1)
@@ -259,7 +287,7 @@ class TestMemorySessionStorage:
         # Get sessions for user 123
         user_sessions = await storage.get_user_sessions(123)
         assert len(user_sessions) == 2
-        assert all(s.user_id == 123 for s in user_sessions)
+        assert {s.user_id for s in user_sessions} == {123}
 
         # Get sessions for user 456
         user_sessions = await storage.get_user_sessions(456)
@@ -271,81 +299,64 @@ class TestSessionManager:
     """Test session manager."""
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestToolMonitorConfigBypass:
     """Test ToolMonitor behavior when tool validation is disabled."""
 
-    async def test_validate_tool_call_bypasses_allowlist_when_disabled(self):
-        monitor = DefaultToolAuthorizer(
-            _MonitorConfigStub(disable_tool_validation=True), None
-        )
-
-        allowed, error = await monitor.validate_tool_call(
-            tool_name="TotallyCustomTool",
-            tool_input={},
-            working_directory=Path("/tmp"),
-            user_id=123,
-        )
-
-        assert allowed is True
-        assert error is None
-        assert monitor.tool_usage["TotallyCustomTool"] == 1
-
-    async def test_validate_tool_call_enforces_allowlist_when_enabled(self):
-        monitor = DefaultToolAuthorizer(
-            _MonitorConfigStub(disable_tool_validation=False), None
-        )
-
-        allowed, error = await monitor.validate_tool_call(
-            tool_name="TotallyCustomTool",
-            tool_input={},
-            working_directory=Path("/tmp"),
-            user_id=123,
-        )
-
-        assert allowed is False
-        assert "Tool not allowed" in (error or "")
-
-    async def test_disable_tool_validation_still_rejects_invalid_file_path(self):
-        validator = _ValidatorStub(should_allow_path=False)
-        monitor = DefaultToolAuthorizer(
-            _MonitorConfigStub(disable_tool_validation=True), validator
-        )
-
-        allowed, error = await monitor.validate_tool_call(
-            tool_name="Read",
-            tool_input={"file_path": "../secret"},
-            working_directory=Path("/tmp"),
-            user_id=123,
-        )
-
-        assert allowed is False
-        assert error == "invalid path"
-
-    async def test_disable_tool_validation_still_rejects_dangerous_bash(self):
-        monitor = DefaultToolAuthorizer(
-            _MonitorConfigStub(disable_tool_validation=True), None
-        )
+    @pytest.mark.parametrize(
+        "monitor_fixture, tool_name, tool_input, expected_error",
+        [
+            pytest.param(
+                "bypass_monitor",
+                "TotallyCustomTool",
+                {},
+                None,
+                id="bypasses-allowlist",
+            ),
+            pytest.param(
+                "enforcing_monitor",
+                "TotallyCustomTool",
+                {},
+                "Tool not allowed",
+                id="enforces-allowlist",
+            ),
+            pytest.param(
+                "bypass_monitor_rejecting_paths",
+                "Read",
+                {"file_path": "../secret"},
+                "invalid path",
+                id="still-rejects-invalid-file-path",
+            ),
+            pytest.param(
+                "bypass_monitor",
+                "Bash",
+                {"command": "echo test > /tmp/out"},
+                "Dangerous command pattern detected",
+                id="still-rejects-dangerous-bash",
+            ),
+        ],
+    )
+    async def test_validate_tool_call(
+        self, request, monitor_fixture, tool_name, tool_input, expected_error
+    ):
+        monitor = request.getfixturevalue(monitor_fixture)
+        # The monitors are shared, so compare against a snapshot of usage.
+        before = dict(monitor.tool_usage)
 
         allowed, error = await monitor.validate_tool_call(
-            tool_name="Bash",
-            tool_input={"command": "echo test > /tmp/out"},
-            working_directory=Path("/tmp"),
+            tool_name=tool_name,
+            tool_input=tool_input,
+            working_directory=_TMP,
             user_id=123,
         )
 
-        assert allowed is False
-        assert "Dangerous command pattern detected" in (error or "")
-
-    @pytest.fixture
-    def config(self, tmp_path):
-        """Create test config."""
-        return Settings(
-            telegram_bot_token="test:token",
-            telegram_bot_username="testbot",
-            approved_directory=tmp_path,
-            session_timeout_hours=24,
-            max_sessions_per_user=2,
-        )
+        if expected_error is None:
+            assert allowed is True
+            assert error is None
+            assert monitor.tool_usage[tool_name] - before.get(tool_name, 0) == 1
+        else:
+            assert allowed is False
+            assert expected_error in (error or "")
 
     @pytest.fixture
     def storage(self):
@@ -361,31 +372,25 @@ class TestToolMonitorConfigBypass:
         """Test creating new session."""
         session = await session_manager.get_or_create_session(
             user_id=123,
-            project_path=Path("/test/project"),
+            project_path=_PROJECT,
         )
 
         assert session.user_id == 123
-        assert session.project_path == Path("/test/project")
+        assert session.project_path == _PROJECT
         assert session.is_new_session is True
         assert session.session_id == ""  # Empty until Codex responds
 
     async def test_get_existing_session(self, session_manager):
         """Test getting existing session by ID after it has a real session_id."""
         # Simulate a session that has already received a real ID from Codex
-        existing = CodexSession(
-            session_id="real-session-id",
-            user_id=123,
-            project_path=Path("/test/project"),
-            created_at=datetime.now(UTC),
-            last_used=datetime.now(UTC),
-        )
+        existing = _mk_session(session_id="real-session-id", project_path=_PROJECT)
         await session_manager.storage.save_session(existing)
         session_manager.active_sessions["real-session-id"] = existing
 
         # Get same session by ID
         session2 = await session_manager.get_or_create_session(
             user_id=123,
-            project_path=Path("/test/project"),
+            project_path=_PROJECT,
             session_id="real-session-id",
         )
 
@@ -395,16 +400,18 @@ class TestToolMonitorConfigBypass:
         """Test session limit enforcement."""
         # Seed sessions that have already received real IDs (simulating
         # the full create -> Codex responds -> update_session lifecycle)
-        for i, path in enumerate(["/test/project1", "/test/project2"], start=1):
-            s = CodexSession(
+        sessions = [
+            _mk_session(
                 session_id=f"session-{i}",
-                user_id=123,
                 project_path=Path(path),
-                created_at=datetime.now(UTC),
-                last_used=datetime.now(UTC) - timedelta(hours=i),  # older = higher i
+                last_used=_NOW - timedelta(hours=i),  # older = higher i
             )
-            await session_manager.storage.save_session(s)
-            session_manager.active_sessions[s.session_id] = s
+            for i, path in enumerate(["/test/project1", "/test/project2"], start=1)
+        ]
+        await asyncio.gather(
+            *(session_manager.storage.save_session(s) for s in sessions)
+        )
+        session_manager.active_sessions.update({s.session_id: s for s in sessions})
 
         # Verify we have 2 sessions
         assert len(await session_manager._get_user_sessions(123)) == 2
@@ -425,19 +432,10 @@ class TestToolMonitorConfigBypass:
         assert loaded is None
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestUpdateSessionNewWithoutId:
     """Edge case: Codex returns no session_id for a brand-new session."""
 
-    @pytest.fixture
-    def config(self, tmp_path):
-        return Settings(
-            telegram_bot_token="test:token",
-            telegram_bot_username="testbot",
-            approved_directory=tmp_path,
-            session_timeout_hours=24,
-            max_sessions_per_user=2,
-        )
-
     @pytest.fixture
     def session_manager(self, config):
         return SessionManager(config, _MemorySessionStorage())
@@ -450,12 +448,14 @@ class TestUpdateSessionNewWithoutId:
         assert session.is_new_session is True
 
         # Simulate Codex returning empty session_id
-        response = CodexResponse(
+        response = replace(
+            _BASE_RESPONSE,
             content="hello",
             session_id="",
             cost=0.001,
             duration_ms=50,
             num_turns=1,
+            tools_used=[],
         )
 
         await session_manager.update_session(session, response)
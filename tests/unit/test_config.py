@@ -1,7 +1,6 @@
 """Test configuration loading and validation."""
 
-import os
-import tempfile
+import re
 from pathlib import Path
 
 import pytest
@@ -11,6 +10,26 @@ from src.config import Settings, create_test_config, load_config
 from src.config.features import FeatureFlags
 from src.exceptions import ConfigurationError
 
+# Registry with a single project, ``app``, for the project-threads tests.
+_PROJECTS_YAML = "projects:\n  - slug: app\n    name: App\n    path: app\n"
+
+
+@pytest.fixture(scope="module")
+def shared_tmp_dir(tmp_path_factory):
+    """Existing directory reused as approved_directory by the tests below."""
+    return tmp_path_factory.mktemp("cfg")
+
+
+@pytest.fixture(scope="module")
+def projects_yaml_fixture(tmp_path_factory):
+    """Approved directory with an ``app`` project and a registry naming it."""
+    root = tmp_path_factory.mktemp("threads")
+    project_dir = root / "projects"
+    (project_dir / "app").mkdir(parents=True)
+    config_file = root / "projects.yaml"
+    config_file.write_text(_PROJECTS_YAML, encoding="utf-8")
+    return project_dir, config_file
+
 
 def test_settings_validation_required_fields(monkeypatch):
     """Test that missing required fields raise validation errors."""
@@ -45,106 +64,91 @@ def test_settings_with_valid_data(tmp_path):
     assert settings.approved_directory == test_dir
 
 
-def test_allowed_users_parsing():
+def test_allowed_users_parsing(shared_tmp_dir):
     """Test parsing of comma-separated user IDs."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        settings = Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=tmp_dir,
-            allowed_users="123,456,789",
-        )
+    settings = Settings(
+        telegram_bot_token="test_token",
+        telegram_bot_username="test_bot",
+        approved_directory=shared_tmp_dir,
+        allowed_users="123,456,789",
+    )
 
-        assert settings.allowed_users == [123, 456, 789]
+    assert settings.allowed_users == [123, 456, 789]
 
 
-def test_allowed_users_parsing_with_spaces():
+def test_allowed_users_parsing_with_spaces(shared_tmp_dir):
     """Test parsing with spaces around user IDs."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        settings = Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=tmp_dir,
-            allowed_users="123, 456 , 789",
-        )
+    settings = Settings(
+        telegram_bot_token="test_token",
+        telegram_bot_username="test_bot",
+        approved_directory=shared_tmp_dir,
+        allowed_users="123, 456 , 789",
+    )
 
-        assert settings.allowed_users == [123, 456, 789]
+    assert settings.allowed_users == [123, 456, 789]
 
 
-def test_security_relaxation_settings_defaults_and_overrides():
+def test_security_relaxation_settings_defaults_and_overrides(base_settings):
     """Security relaxation settings should default to False and be configurable."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        defaults = Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=tmp_dir,
-        )
-        assert defaults.disable_security_patterns is False
-        assert defaults.disable_tool_validation is False
+    assert base_settings.disable_security_patterns is False
+    assert base_settings.disable_tool_validation is False
 
-        overridden = Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=tmp_dir,
-            disable_security_patterns=True,
-            disable_tool_validation=True,
-        )
-        assert overridden.disable_security_patterns is True
-        assert overridden.disable_tool_validation is True
+    overridden = Settings(
+        telegram_bot_token="test_token",
+        telegram_bot_username="test_bot",
+        approved_directory=base_settings.approved_directory,
+        disable_security_patterns=True,
+        disable_tool_validation=True,
+    )
+    assert overridden.disable_security_patterns is True
+    assert overridden.disable_tool_validation is True
 
 
 def test_approved_directory_validation_nonexistent():
     """Test validation fails for non-existent directory."""
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="does not exist"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
             approved_directory="/nonexistent/directory",
         )
 
-    assert "does not exist" in str(exc_info.value)
-
 
 def test_approved_directory_validation_not_directory(tmp_path):
     """Test validation fails when path is not a directory."""
     test_file = tmp_path / "not_a_dir.txt"
     test_file.write_text("test")
 
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="not a directory"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
             approved_directory=str(test_file),
         )
 
-    assert "not a directory" in str(exc_info.value)
-
 
-def test_auth_token_validation():
+def test_auth_token_validation(shared_tmp_dir):
     """Test auth token secret validation."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        # Should fail when token auth enabled but no secret
-        with pytest.raises(ValidationError) as exc_info:
-            Settings(
-                telegram_bot_token="test_token",
-                telegram_bot_username="test_bot",
-                approved_directory=tmp_dir,
-                enable_token_auth=True,
-            )
-
-        assert "auth_token_secret required" in str(exc_info.value)
-
-        # Should succeed when both enabled and secret provided
-        settings = Settings(
+    # Should fail when token auth enabled but no secret
+    with pytest.raises(ValidationError, match="auth_token_secret required"):
+        Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
-            approved_directory=tmp_dir,
+            approved_directory=shared_tmp_dir,
             enable_token_auth=True,
-            auth_token_secret="secret123",
         )
 
-        assert settings.enable_token_auth is True
-        assert settings.auth_secret_str == "secret123"
+    # Should succeed when both enabled and secret provided
+    settings = Settings(
+        telegram_bot_token="test_token",
+        telegram_bot_username="test_bot",
+        approved_directory=shared_tmp_dir,
+        enable_token_auth=True,
+        auth_token_secret="secret123",
+    )
+
+    assert settings.enable_token_auth is True
+    assert settings.auth_secret_str == "secret123"
 
 
 def test_mcp_config_validation(tmp_path, monkeypatch):
@@ -157,7 +161,7 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
     monkeypatch.delenv("MCP_CONFIG_PATH", raising=False)
 
     # Should fail when MCP enabled but no config path
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="mcp_config_path required"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
@@ -166,10 +170,8 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
             mcp_config_path=None,
         )
 
-    assert "mcp_config_path required" in str(exc_info.value)
-
     # Should fail when config file doesn't exist
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="does not exist"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
@@ -178,13 +180,24 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
             mcp_config_path="/nonexistent/config.json",
         )
 
-    assert "does not exist" in str(exc_info.value)
+    # Should fail the same way when a parent of the path is a regular file
+    plain_file = tmp_path / "plain.txt"
+    plain_file.write_text("")
+
+    with pytest.raises(ValidationError, match="does not exist"):
+        Settings(
+            telegram_bot_token="test_token",
+            telegram_bot_username="test_bot",
+            approved_directory=str(test_dir),
+            enable_mcp=True,
+            mcp_config_path=str(plain_file / "config.json"),
+        )
 
     # Should fail when config file is not valid JSON
     bad_json_file = tmp_path / "bad.json"
     bad_json_file.write_text("not json at all")
 
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="not valid JSON"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
@@ -193,13 +206,11 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
             mcp_config_path=str(bad_json_file),
         )
 
-    assert "not valid JSON" in str(exc_info.value)
-
     # Should fail when config file is missing mcpServers key
     no_servers_file = tmp_path / "no_servers.json"
     no_servers_file.write_text('{"test": true}')
 
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="mcpServers"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
@@ -208,13 +219,11 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
             mcp_config_path=str(no_servers_file),
         )
 
-    assert "mcpServers" in str(exc_info.value)
-
     # Should fail when mcpServers is empty
     empty_servers_file = tmp_path / "empty_servers.json"
     empty_servers_file.write_text('{"mcpServers": {}}')
 
-    with pytest.raises(ValidationError) as exc_info:
+    with pytest.raises(ValidationError, match="at least one server"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
@@ -223,8 +232,6 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
             mcp_config_path=str(empty_servers_file),
         )
 
-    assert "at least one server" in str(exc_info.value)
-
     # Should succeed with valid MCP config
     config_file = tmp_path / "mcp_config.json"
     config_file.write_text(
@@ -244,230 +251,172 @@ def test_mcp_config_validation(tmp_path, monkeypatch):
     assert settings.mcp_config_path == config_file
 
 
-def test_log_level_validation():
-    """Test log level validation."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        # Should fail with invalid log level
-        with pytest.raises(ValidationError) as exc_info:
-            Settings(
-                telegram_bot_token="test_token",
-                telegram_bot_username="test_bot",
-                approved_directory=tmp_dir,
-                log_level="INVALID",
-            )
-
-        assert "must be one of" in str(exc_info.value)
-
-        # Should succeed with valid log level
-        settings = Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=tmp_dir,
-            log_level="debug",  # Should be converted to uppercase
-        )
-
-        assert settings.log_level == "DEBUG"
-
-
-def test_project_threads_validation_requires_chat_id_in_group_mode(tmp_path):
-    """Group thread mode requires project_threads_chat_id."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
-    app_dir = project_dir / "app"
-    app_dir.mkdir()
-    config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
-        "projects:\n" "  - slug: app\n" "    name: App\n" "    path: app\n",
-        encoding="utf-8",
+def test_mcp_config_revalidated_after_file_changes(shared_tmp_dir, tmp_path):
+    """Test the cached MCP config check notices edits to the file."""
+    config_file = tmp_path / "mcp.json"
+    config_file.write_text('{"mcpServers": {"s": {"command": "echo"}}}')
+    kwargs = dict(
+        telegram_bot_token="test_token",
+        telegram_bot_username="test_bot",
+        approved_directory=shared_tmp_dir,
+        enable_mcp=True,
+        mcp_config_path=str(config_file),
     )
 
-    with pytest.raises(ValidationError) as exc_info:
-        Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=str(project_dir),
-            enable_project_threads=True,
-            project_threads_mode="group",
-            projects_config_path=str(config_file),
-        )
+    assert Settings(**kwargs).mcp_config_path == config_file
+    assert Settings(**kwargs).mcp_config_path == config_file
 
-    assert "project_threads_chat_id required" in str(exc_info.value)
+    config_file.write_text('{"mcpServers": {}}')
+    with pytest.raises(ValidationError, match="at least one server"):
+        Settings(**kwargs)
 
 
-def test_project_threads_validation_requires_projects_config(tmp_path):
-    """Thread mode requires projects_config_path."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
+def test_codex_home_is_expanded_on_load(tmp_path, monkeypatch):
+    """Test CODEX_HOME expands ~ when settings load and blank means unset."""
+    monkeypatch.setenv("HOME", str(tmp_path))
 
-    with pytest.raises(ValidationError) as exc_info:
-        Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=str(project_dir),
-            enable_project_threads=True,
-            project_threads_chat_id=-1001234567890,
-            projects_config_path=None,
-        )
-
-    assert "projects_config_path required" in str(exc_info.value)
+    settings = create_test_config(
+        approved_directory=str(tmp_path), codex_home="~/codex-home"
+    )
+    assert settings.codex_home == tmp_path / "codex-home"
 
+    settings = create_test_config(approved_directory=str(tmp_path), codex_home="  ")
+    assert settings.codex_home is None
 
-def test_project_threads_validation_blank_projects_config_path_fails(tmp_path):
-    """Blank projects_config_path should be treated as missing."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
 
-    with pytest.raises(ValidationError) as exc_info:
+def test_log_level_validation(shared_tmp_dir):
+    """Test log level validation."""
+    # Should fail with invalid log level
+    with pytest.raises(ValidationError, match="must be one of"):
         Settings(
             telegram_bot_token="test_token",
             telegram_bot_username="test_bot",
-            approved_directory=str(project_dir),
-            enable_project_threads=True,
-            project_threads_mode="private",
-            projects_config_path="",
+            approved_directory=shared_tmp_dir,
+            log_level="INVALID",
         )
 
-    assert "projects_config_path required" in str(exc_info.value)
-
-
-def test_project_threads_validation_private_mode_no_chat_id(tmp_path):
-    """Private thread mode does not require project_threads_chat_id."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
-    app_dir = project_dir / "app"
-    app_dir.mkdir()
-    config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
-        "projects:\n" "  - slug: app\n" "    name: App\n" "    path: app\n",
-        encoding="utf-8",
-    )
-
+    # Should succeed with valid log level
     settings = Settings(
         telegram_bot_token="test_token",
         telegram_bot_username="test_bot",
-        approved_directory=str(project_dir),
-        enable_project_threads=True,
-        project_threads_mode="private",
-        projects_config_path=str(config_file),
+        approved_directory=shared_tmp_dir,
+        log_level="debug",  # Should be converted to uppercase
     )
 
-    assert settings.project_threads_mode == "private"
-    assert settings.project_threads_chat_id is None
-
-
-def test_project_threads_validation_private_mode_empty_chat_id(tmp_path):
-    """Private mode accepts blank project_threads_chat_id from env/.env."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
-    app_dir = project_dir / "app"
-    app_dir.mkdir()
-    config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
-        "projects:\n" "  - slug: app\n" "    name: App\n" "    path: app\n",
-        encoding="utf-8",
-    )
-
-    settings = Settings(
+    assert settings.log_level == "DEBUG"
+
+
+# Stands in for the shared projects.yaml path in the parametrized cases below.
+_PROJECTS_CONFIG = object()
+
+
+@pytest.mark.parametrize(
+    "overrides, expected_error",
+    [
+        pytest.param(
+            {"project_threads_mode": "group", "projects_config_path": _PROJECTS_CONFIG},
+            "project_threads_chat_id required",
+            id="group-mode-requires-chat-id",
+        ),
+        pytest.param(
+            {
+                "project_threads_chat_id": -1001234567890,
+                "projects_config_path": None,
+            },
+            "projects_config_path required",
+            id="requires-projects-config",
+        ),
+        pytest.param(
+            {"project_threads_mode": "private", "projects_config_path": ""},
+            "projects_config_path required",
+            id="blank-projects-config-path-is-missing",
+        ),
+        pytest.param(
+            {
+                "project_threads_mode": "private",
+                "projects_config_path": _PROJECTS_CONFIG,
+            },
+            None,
+            id="private-mode-needs-no-chat-id",
+        ),
+        pytest.param(
+            {
+                "project_threads_mode": "private",
+                "project_threads_chat_id": "",
+                "projects_config_path": _PROJECTS_CONFIG,
+            },
+            None,
+            id="private-mode-accepts-blank-chat-id",
+        ),
+        pytest.param(
+            {
+                "project_threads_mode": "group",
+                "project_threads_chat_id": "",
+                "projects_config_path": _PROJECTS_CONFIG,
+            },
+            "project_threads_chat_id required",
+            id="group-mode-rejects-blank-chat-id",
+        ),
+        pytest.param(
+            {"project_threads_mode": "invalid"},
+            "project_threads_mode must be one of",
+            id="invalid-mode",
+        ),
+    ],
+)
+def test_project_threads_validation(projects_yaml_fixture, overrides, expected_error):
+    """Project thread settings are validated across modes and chat IDs."""
+    project_dir, config_file = projects_yaml_fixture
+    if overrides.get("projects_config_path") is _PROJECTS_CONFIG:
+        overrides = {**overrides, "projects_config_path": str(config_file)}
+    kwargs = dict(
         telegram_bot_token="test_token",
         telegram_bot_username="test_bot",
         approved_directory=str(project_dir),
         enable_project_threads=True,
-        project_threads_mode="private",
-        project_threads_chat_id="",
-        projects_config_path=str(config_file),
+        **overrides,
     )
 
+    if expected_error is not None:
+        with pytest.raises(ValidationError, match=re.escape(expected_error)):
+            Settings(**kwargs)
+        return
+
+    settings = Settings(**kwargs)
     assert settings.project_threads_mode == "private"
     assert settings.project_threads_chat_id is None
 
 
-def test_project_threads_validation_group_mode_empty_chat_id_fails(tmp_path):
-    """Group mode rejects blank project_threads_chat_id."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
-    app_dir = project_dir / "app"
-    app_dir.mkdir()
-    config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
-        "projects:\n" "  - slug: app\n" "    name: App\n" "    path: app\n",
-        encoding="utf-8",
-    )
-
-    with pytest.raises(ValidationError) as exc_info:
-        Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=str(project_dir),
-            enable_project_threads=True,
-            project_threads_mode="group",
-            project_threads_chat_id="",
-            projects_config_path=str(config_file),
-        )
-
-    assert "project_threads_chat_id required" in str(exc_info.value)
-
-
-def test_project_threads_validation_invalid_mode(tmp_path):
-    """Invalid project thread mode should fail validation."""
-    project_dir = tmp_path / "projects"
-    project_dir.mkdir()
-
-    with pytest.raises(ValidationError) as exc_info:
-        Settings(
-            telegram_bot_token="test_token",
-            telegram_bot_username="test_bot",
-            approved_directory=str(project_dir),
-            enable_project_threads=True,
-            project_threads_mode="invalid",
-        )
-
-    assert "project_threads_mode must be one of" in str(exc_info.value)
-
-
-def test_computed_properties(tmp_path):
+def test_computed_properties(base_settings):
     """Test computed properties."""
-    test_dir = tmp_path / "projects"
-    test_dir.mkdir()
-
     # Test production mode detection
-    dev_settings = Settings(
-        telegram_bot_token="test_token",
-        telegram_bot_username="test_bot",
-        approved_directory=str(test_dir),
-        debug=True,
-    )
+    dev_settings = base_settings.model_copy(update={"debug": True})
     assert dev_settings.is_production is False
 
-    prod_settings = Settings(
-        telegram_bot_token="test_token",
-        telegram_bot_username="test_bot",
-        approved_directory=str(test_dir),
-        debug=False,
-        development_mode=False,
+    prod_settings = base_settings.model_copy(
+        update={"debug": False, "development_mode": False}
     )
     assert prod_settings.is_production is True
 
     # Test database path extraction
-    sqlite_settings = Settings(
-        telegram_bot_token="test_token",
-        telegram_bot_username="test_bot",
-        approved_directory=str(test_dir),
-        database_url="sqlite:///data/bot.db",
+    sqlite_settings = base_settings.model_copy(
+        update={"database_url": "sqlite:///data/bot.db"}
     )
     assert sqlite_settings.database_path == Path("data/bot.db").resolve()
 
 
-def test_feature_flags():
+def test_feature_flags(tmp_path):
     """Test feature flag system."""
     # Create test MCP config file with valid structure before creating settings
     mcp_config = (
         '{"mcpServers": {"test-server": {"command": "echo", "args": ["hello"]}}}'
     )
-    Path("/tmp/test_mcp.json").write_text(mcp_config)
+    mcp_path = tmp_path / "mcp.json"
+    mcp_path.write_text(mcp_config)
 
     settings = create_test_config(
         enable_mcp=True,
-        mcp_config_path="/tmp/test_mcp.json",
+        mcp_config_path=str(mcp_path),
         enable_git_integration=True,
         enable_file_uploads=False,
         enable_token_auth=True,
@@ -491,37 +440,23 @@ def test_feature_flags():
     assert features.is_feature_enabled("git") is True
     assert features.is_feature_enabled("nonexistent") is False
 
-    # Cleanup test file
-    Path("/tmp/test_mcp.json").unlink(missing_ok=True)
 
-
-def test_environment_loading():
+def test_environment_loading(shared_tmp_dir, monkeypatch):
     """Test environment-specific configuration loading."""
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("TELEGRAM_BOT_USERNAME", "test_bot")
+    monkeypatch.setenv("APPROVED_DIRECTORY", str(shared_tmp_dir))
+
     # Test development environment
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        os.environ["TELEGRAM_BOT_TOKEN"] = "test_token"
-        os.environ["TELEGRAM_BOT_USERNAME"] = "test_bot"
-        os.environ["APPROVED_DIRECTORY"] = tmp_dir
-
-        try:
-            config = load_config(env="development")
-            assert config.debug is True
-            assert config.development_mode is True
-            assert config.log_level == "DEBUG"
-
-            config = load_config(env="production")
-            assert config.debug is False
-            assert config.development_mode is False
-            assert config.log_level == "INFO"
-
-        finally:
-            # Clean up environment
-            for key in [
-                "TELEGRAM_BOT_TOKEN",
-                "TELEGRAM_BOT_USERNAME",
-                "APPROVED_DIRECTORY",
-            ]:
-                os.environ.pop(key, None)
+    config = load_config(env="development")
+    assert config.debug is True
+    assert config.development_mode is True
+    assert config.log_level == "DEBUG"
+
+    config = load_config(env="production")
+    assert config.debug is False
+    assert config.development_mode is False
+    assert config.log_level == "INFO"
 
 
 def test_create_test_config():
@@ -544,21 +479,14 @@ def test_create_test_config():
     assert config.codex_max_turns == 5
 
 
-def test_configuration_error_handling():
+def test_configuration_error_handling(tmp_path, monkeypatch):
     """Test configuration error handling."""
     # Test with invalid directory permissions (simulate by using a file)
-    with tempfile.NamedTemporaryFile() as tmp_file:
-        os.environ["TELEGRAM_BOT_TOKEN"] = "test_token"
-        os.environ["TELEGRAM_BOT_USERNAME"] = "test_bot"
-        os.environ["APPROVED_DIRECTORY"] = tmp_file.name  # File instead of directory
-
-        try:
-            with pytest.raises(ConfigurationError):
-                load_config()
-        finally:
-            for key in [
-                "TELEGRAM_BOT_TOKEN",
-                "TELEGRAM_BOT_USERNAME",
-                "APPROVED_DIRECTORY",
-            ]:
-                os.environ.pop(key, None)
+    not_a_dir = tmp_path / "not_a_dir"
+    not_a_dir.touch()
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("TELEGRAM_BOT_USERNAME", "test_bot")
+    monkeypatch.setenv("APPROVED_DIRECTORY", str(not_a_dir))  # File, not directory
+
+    with pytest.raises(ConfigurationError):
+        load_config()
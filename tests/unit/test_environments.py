@@ -47,3 +47,11 @@ def test_config_as_dict_excludes_internals():
     for key in config_dict.keys():
         assert not key.startswith("_")
         assert not callable(getattr(DevelopmentConfig, key))
+
+
+def test_config_as_dict_returns_independent_copies():
+    """Test that mutating one as_dict() result doesn't leak into the next."""
+    first = TestingConfig.as_dict()
+    first["approved_directory"] = "/elsewhere"
+
+    assert TestingConfig.as_dict()["approved_directory"] == "/tmp/test_projects"
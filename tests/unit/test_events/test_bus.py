@@ -2,9 +2,15 @@
 
 import asyncio
 from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import pytest
 
 from src.events.bus import Event, EventBus
 
+# Every test here is async; run them all on one module-scoped event loop.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 @dataclass
 class BusTestEvent(Event):
@@ -22,131 +28,153 @@ class OtherEvent(Event):
     source: str = "test"
 
 
-class TestEventBus:
-    """Tests for EventBus."""
-
-    async def test_publish_and_subscribe(self) -> None:
-        """Events are delivered to matching handlers."""
-        bus = EventBus()
-        received = []
-
-        async def handler(event: Event) -> None:
-            received.append(event)
-
-        bus.subscribe(BusTestEvent, handler)
-        await bus.start()
-
-        event = BusTestEvent(data="hello")
-        await bus.publish(event)
-
-        # Give the processor time to dispatch
-        await asyncio.sleep(0.1)
-        await bus.stop()
-
-        assert len(received) == 1
-        assert isinstance(received[0], BusTestEvent)
-        assert received[0].data == "hello"
-
-    async def test_handler_receives_only_subscribed_type(self) -> None:
-        """Handler only receives events of the subscribed type."""
-        bus = EventBus()
-        received_test = []
-        received_other = []
-
-        async def test_handler(event: Event) -> None:
-            received_test.append(event)
-
-        async def other_handler(event: Event) -> None:
-            received_other.append(event)
-
-        bus.subscribe(BusTestEvent, test_handler)
-        bus.subscribe(OtherEvent, other_handler)
-        await bus.start()
-
-        await bus.publish(BusTestEvent(data="a"))
-        await bus.publish(OtherEvent(value=42))
-
-        await asyncio.sleep(0.1)
-        await bus.stop()
-
-        assert len(received_test) == 1
-        assert len(received_other) == 1
-        assert received_test[0].data == "a"
-        assert received_other[0].value == 42
-
-    async def test_global_handler_receives_all(self) -> None:
-        """Global handlers receive every event."""
-        bus = EventBus()
-        received = []
-
-        async def global_handler(event: Event) -> None:
-            received.append(event)
-
-        bus.subscribe_all(global_handler)
-        await bus.start()
-
-        await bus.publish(BusTestEvent(data="x"))
-        await bus.publish(OtherEvent(value=1))
-
-        await asyncio.sleep(0.1)
-        await bus.stop()
-
-        assert len(received) == 2
-
-    async def test_handler_error_does_not_crash_bus(self) -> None:
-        """A failing handler doesn't prevent other handlers from running."""
-        bus = EventBus()
-        received = []
-
-        async def bad_handler(event: Event) -> None:
-            raise RuntimeError("boom")
-
-        async def good_handler(event: Event) -> None:
-            received.append(event)
-
-        bus.subscribe(BusTestEvent, bad_handler)
-        bus.subscribe(BusTestEvent, good_handler)
-        await bus.start()
-
-        await bus.publish(BusTestEvent(data="test"))
-        await asyncio.sleep(0.1)
-        await bus.stop()
-
-        # Good handler still receives the event
-        assert len(received) == 1
-
-    async def test_event_has_id_and_timestamp(self) -> None:
-        """Events get auto-generated ID and timestamp."""
-        event = BusTestEvent(data="hi")
-        assert event.id
-        assert event.timestamp
-        assert event.event_type == "BusTestEvent"
-
-    async def test_multiple_handlers_for_same_type(self) -> None:
-        """Multiple handlers can subscribe to the same event type."""
-        bus = EventBus()
-        results = []
-
-        async def handler_a(event: Event) -> None:
-            results.append("a")
-
-        async def handler_b(event: Event) -> None:
-            results.append("b")
-
-        bus.subscribe(BusTestEvent, handler_a)
-        bus.subscribe(BusTestEvent, handler_b)
-        await bus.start()
-
-        await bus.publish(BusTestEvent())
-        await asyncio.sleep(0.1)
-        await bus.stop()
-
-        assert "a" in results
-        assert "b" in results
+async def _run_scenario(
+    subscriptions: Sequence[Tuple[str, Optional[Type[Event]]]],
+    events: Sequence[Event],
+) -> Dict[str, List[Event]]:
+    """Publish ``events`` on a fresh bus and return what each handler saw.
+
+    Each subscription is ``(name, event_type)``; ``None`` subscribes the
+    recording handler to all events.
+    """
+    bus = EventBus()
+    received: Dict[str, List[Event]] = {name: [] for name, _ in subscriptions}
+
+    for name, event_type in subscriptions:
+
+        async def handler(event: Event, seen: List[Event] = received[name]) -> None:
+            seen.append(event)
+
+        if event_type is None:
+            bus.subscribe_all(handler)
+        else:
+            bus.subscribe(event_type, handler)
+
+    await bus.start()
+    await bus.publish_many(events)
+    await asyncio.wait_for(bus.join(), timeout=1.0)
+    await bus.stop()
+
+    return received
+
+
+@pytest.mark.parametrize(
+    "subscriptions, events, expected",
+    [
+        pytest.param(
+            [("handler", BusTestEvent)],
+            [BusTestEvent(data="hello")],
+            {"handler": [0]},
+            id="publish-and-subscribe",
+        ),
+        pytest.param(
+            [("test", BusTestEvent), ("other", OtherEvent)],
+            [BusTestEvent(data="a"), OtherEvent(value=42)],
+            {"test": [0], "other": [1]},
+            id="handler-receives-only-subscribed-type",
+        ),
+        pytest.param(
+            [("a", BusTestEvent), ("b", BusTestEvent)],
+            [BusTestEvent()],
+            {"a": [0], "b": [0]},
+            id="multiple-handlers-for-same-type",
+        ),
+        pytest.param(
+            [("global", None)],
+            [BusTestEvent(data="x"), OtherEvent(value=1)],
+            {"global": [0, 1]},
+            id="global-handler-receives-all",
+        ),
+    ],
+)
+async def test_dispatch(
+    subscriptions: Sequence[Tuple[str, Optional[Type[Event]]]],
+    events: Sequence[Event],
+    expected: Dict[str, List[int]],
+) -> None:
+    """Each handler receives exactly the published events it subscribed to."""
+    received = await _run_scenario(subscriptions, events)
+
+    assert received == {
+        name: [events[i] for i in indexes] for name, indexes in expected.items()
+    }
+
+
+async def test_handler_error_does_not_crash_bus() -> None:
+    """A failing handler doesn't prevent other handlers from running."""
+    bus = EventBus()
+    received = []
+
+    async def bad_handler(event: Event) -> None:
+        raise RuntimeError("boom")
+
+    async def good_handler(event: Event) -> None:
+        received.append(event)
+
+    bus.subscribe(BusTestEvent, bad_handler)
+    bus.subscribe(BusTestEvent, good_handler)
+    await bus.start()
+
+    await bus.publish(BusTestEvent(data="test"))
+    await asyncio.wait_for(bus.join(), timeout=1.0)
+    await bus.stop()
+
+    # Good handler still receives the event
+    assert len(received) == 1
+
+
+async def test_event_has_id_and_timestamp() -> None:
+    """Events get auto-generated ID and timestamp."""
+    event = BusTestEvent(data="hi")
+    assert event.id
+    assert event.timestamp
+    assert event.event_type == "BusTestEvent"
+
+
+async def test_publish_many_preserves_order() -> None:
+    """A batch is enqueued in full and dispatched in publish order."""
+    bus = EventBus()
+    received = []
+
+    async def handler(event: Event) -> None:
+        received.append(event)
+
+    bus.subscribe_all(handler)
+    events = [BusTestEvent(data=str(i)) for i in range(5)]
+
+    await bus.publish_many(events)
+    assert bus._queue.qsize() == len(events)
+
+    await bus.start()
+    await asyncio.wait_for(bus.join(), timeout=1.0)
+    await bus.stop()
+
+    assert received == events
+
+
+async def test_stop_is_idempotent() -> None:
+    """Stopping an already stopped bus doesn't raise."""
+    bus = EventBus()
+    await bus.start()
+    await asyncio.gather(bus.stop(), bus.stop())
+    await bus.stop()  # Should not raise
+
+
+async def test_bus_restarts_after_stop() -> None:
+    """A stopped bus can be started again and keeps dispatching."""
+    bus = EventBus()
+    received = []
+
+    async def handler(event: Event) -> None:
+        received.append(event)
+
+    bus.subscribe(BusTestEvent, handler)
+    await bus.start()
+    await bus.stop()
+    await bus.start()
+
+    await bus.publish(BusTestEvent(data="again"))
+    await asyncio.wait_for(bus.join(), timeout=1.0)
+    await bus.stop()
 
-    async def test_stop_is_idempotent(self) -> None:
-        """Stopping an already stopped bus doesn't raise."""
-        bus = EventBus()
-        await bus.start()
-        await bus.stop()
-        await bus.stop()  # Should not raise
+    assert [e.data for e in received] == ["again"]
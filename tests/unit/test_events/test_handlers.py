@@ -1,160 +1,157 @@
 """Tests for event handlers."""
 
+import asyncio
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import MagicMock
 
 import pytest
 
-from src.events.bus import EventBus
+from src.events.bus import Event, EventBus
 from src.events.handlers import AgentHandler
 from src.events.types import AgentResponseEvent, ScheduledEvent, WebhookEvent
 
-
-@pytest.fixture
-def event_bus() -> EventBus:
-    return EventBus()
+# The handlers only read events, so these are shared by every test.
+_GITHUB_PUSH = WebhookEvent(
+    provider="github",
+    event_type_name="push",
+    payload={"ref": "refs/heads/main"},
+    delivery_id="del-1",
+)
+_GITHUB_PR_OPENED = WebhookEvent(
+    provider="github",
+    event_type_name="pull_request",
+    payload={"action": "opened", "number": 42},
+)
+_STANDUP = ScheduledEvent(
+    job_name="standup",
+    prompt="Generate daily standup",
+    target_chat_ids=[100],
+)
+_STANDUP_WITH_SKILL = ScheduledEvent(
+    job_name="standup",
+    prompt="morning report",
+    skill_name="daily-standup",
+    target_chat_ids=[100],
+)
+_BIG_PAYLOAD = {"key": "x" * 3000}
+_RESP_ANALYSIS = SimpleNamespace(content="Analysis complete")
 
 
 @pytest.fixture
-def mock_codex() -> AsyncMock:
-    mock = AsyncMock()
-    mock.run_command = AsyncMock()
-    return mock
+def agent_handler(stack) -> AgentHandler:
+    return stack.handler
 
 
 @pytest.fixture
-def agent_handler(event_bus: EventBus, mock_codex: AsyncMock) -> AgentHandler:
-    handler = AgentHandler(
-        event_bus=event_bus,
-        codex_integration=mock_codex,
-        default_working_directory=Path("/tmp/test"),
+def captured_responses(stack) -> List[AgentResponseEvent]:
+    """Every AgentResponseEvent dispatched on the shared bus during the test."""
+    return stack.responses
+
+
+@pytest.fixture(scope="module")
+def null_bus() -> SimpleNamespace:
+    """A bus double that accepts subscriptions and does nothing with them."""
+    return SimpleNamespace(subscribe=lambda *args, **kwargs: None)
+
+
+@pytest.fixture(scope="module")
+def bare_handler(
+    null_bus: SimpleNamespace, default_working_directory: Path
+) -> AgentHandler:
+    """An unregistered handler for tests that only build prompts."""
+    return AgentHandler(
+        event_bus=null_bus,  # type: ignore[arg-type]
+        codex_integration=MagicMock(),
+        default_working_directory=default_working_directory,
         default_user_id=42,
     )
-    handler.register()
-    return handler
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestAgentHandler:
     """Tests for AgentHandler."""
 
-    async def test_webhook_event_triggers_codex(
-        self, event_bus: EventBus, mock_codex: AsyncMock, agent_handler: AgentHandler
-    ) -> None:
-        """Webhook events are processed through Codex."""
-        mock_response = MagicMock()
-        mock_response.content = "Analysis complete"
-        mock_codex.run_command.return_value = mock_response
-
-        published: list = []
-        original_publish = event_bus.publish
-
-        async def capture_publish(event):  # type: ignore[no-untyped-def]
-            published.append(event)
-            await original_publish(event)
-
-        event_bus.publish = capture_publish  # type: ignore[assignment]
-
-        event = WebhookEvent(
-            provider="github",
-            event_type_name="push",
-            payload={"ref": "refs/heads/main"},
-            delivery_id="del-1",
-        )
-
-        await agent_handler.handle_webhook(event)
-
-        mock_codex.run_command.assert_called_once()
-        call_kwargs = mock_codex.run_command.call_args
-        assert "github" in call_kwargs.kwargs["prompt"].lower()
-
-        # Should publish an AgentResponseEvent
-        response_events = [e for e in published if isinstance(e, AgentResponseEvent)]
-        assert len(response_events) == 1
-        assert response_events[0].text == "Analysis complete"
-
-    async def test_scheduled_event_triggers_codex(
-        self, event_bus: EventBus, mock_codex: AsyncMock, agent_handler: AgentHandler
+    @pytest.mark.parametrize(
+        "event, prompt_prefix, prompt_substr, expected_chat_id",
+        [
+            pytest.param(
+                _GITHUB_PUSH,
+                "",
+                "github",
+                0,
+                id="webhook",
+            ),
+            pytest.param(
+                _STANDUP,
+                "",
+                "standup",
+                100,
+                id="scheduled",
+            ),
+            pytest.param(
+                _STANDUP_WITH_SKILL,
+                "/daily-standup",
+                "morning report",
+                100,
+                id="scheduled-with-skill",
+            ),
+        ],
+    )
+    async def test_event_triggers_codex(
+        self,
+        event: Event,
+        prompt_prefix: str,
+        prompt_substr: str,
+        expected_chat_id: int,
+        event_bus: EventBus,
+        fake_codex,
+        agent_handler: AgentHandler,
+        captured_responses: List[AgentResponseEvent],
     ) -> None:
-        """Scheduled events invoke Codex with the job's prompt."""
-        mock_response = MagicMock()
-        mock_response.content = "Standup summary"
-        mock_codex.run_command.return_value = mock_response
+        """Events run Codex once and publish its reply as an AgentResponseEvent.
 
-        published: list = []
-        original_publish = event_bus.publish
+        Scheduled events with a skill_name prepend the skill invocation.
+        """
+        fake_codex.next_response = _RESP_ANALYSIS
 
-        async def capture_publish(event):  # type: ignore[no-untyped-def]
-            published.append(event)
-            await original_publish(event)
+        if isinstance(event, WebhookEvent):
+            await agent_handler.handle_webhook(event)
+        else:
+            await agent_handler.handle_scheduled(event)
 
-        event_bus.publish = capture_publish  # type: ignore[assignment]
+        assert len(fake_codex.calls) == 1
+        prompt = fake_codex.calls[0]["prompt"]
+        assert prompt.startswith(prompt_prefix)
+        assert prompt_substr in prompt.lower()
 
-        event = ScheduledEvent(
-            job_name="standup",
-            prompt="Generate daily standup",
-            target_chat_ids=[100],
-        )
-
-        await agent_handler.handle_scheduled(event)
-
-        mock_codex.run_command.assert_called_once()
-        assert "standup" in mock_codex.run_command.call_args.kwargs["prompt"].lower()
-
-        response_events = [e for e in published if isinstance(e, AgentResponseEvent)]
-        assert len(response_events) == 1
-        assert response_events[0].chat_id == 100
-
-    async def test_scheduled_event_with_skill(
-        self, event_bus: EventBus, mock_codex: AsyncMock, agent_handler: AgentHandler
-    ) -> None:
-        """Scheduled events with skill_name prepend the skill invocation."""
-        mock_response = MagicMock()
-        mock_response.content = "Done"
-        mock_codex.run_command.return_value = mock_response
-
-        event = ScheduledEvent(
-            job_name="standup",
-            prompt="morning report",
-            skill_name="daily-standup",
-            target_chat_ids=[100],
-        )
-
-        await agent_handler.handle_scheduled(event)
-
-        prompt = mock_codex.run_command.call_args.kwargs["prompt"]
-        assert prompt.startswith("/daily-standup")
-        assert "morning report" in prompt
+        await asyncio.wait_for(event_bus.join(), timeout=1.0)
+        assert len(captured_responses) == 1
+        assert captured_responses[0].chat_id == expected_chat_id
+        assert captured_responses[0].text == "Analysis complete"
 
     async def test_codex_error_does_not_propagate(
-        self, event_bus: EventBus, mock_codex: AsyncMock, agent_handler: AgentHandler
+        self, fake_codex, agent_handler: AgentHandler
     ) -> None:
         """Agent errors are logged but don't crash the handler."""
-        mock_codex.run_command.side_effect = RuntimeError("SDK error")
-
-        event = WebhookEvent(
-            provider="github",
-            event_type_name="push",
-            payload={},
-        )
+        fake_codex.raise_ = RuntimeError("SDK error")
 
         # Should not raise
-        await agent_handler.handle_webhook(event)
+        await agent_handler.handle_webhook(_GITHUB_PUSH)
 
-    def test_build_webhook_prompt(self, agent_handler: AgentHandler) -> None:
-        """Webhook prompt includes provider and event info."""
-        event = WebhookEvent(
-            provider="github",
-            event_type_name="pull_request",
-            payload={"action": "opened", "number": 42},
-        )
 
-        prompt = agent_handler._build_webhook_prompt(event)
+class TestAgentHandlerPrompts:
+    """Tests for AgentHandler's prompt building helpers."""
+
+    def test_build_webhook_prompt(self, bare_handler: AgentHandler) -> None:
+        """Webhook prompt includes provider and event info."""
+        prompt = bare_handler._build_webhook_prompt(_GITHUB_PR_OPENED)
         assert "github" in prompt.lower()
         assert "pull_request" in prompt
         assert "action: opened" in prompt
 
-    def test_payload_summary_truncation(self, agent_handler: AgentHandler) -> None:
+    def test_payload_summary_truncation(self, bare_handler: AgentHandler) -> None:
         """Large payloads are truncated in the summary."""
-        big_payload = {"key": "x" * 3000}
-        summary = agent_handler._summarize_payload(big_payload)
+        summary = bare_handler._summarize_payload(_BIG_PAYLOAD)
         assert len(summary) <= 2100  # 2000 + truncation message
@@ -9,6 +9,8 @@ from src.events.types import (
     WebhookEvent,
 )
 
+_PROJECTS_MYAPP = Path("/projects/myapp")
+
 
 class TestEventTypes:
     """Tests for concrete event dataclasses."""
@@ -57,7 +59,7 @@ class TestEventTypes:
             job_name="standup",
             prompt="",
             skill_name="daily-standup",
-            working_directory=Path("/projects/myapp"),
+            working_directory=_PROJECTS_MYAPP,
         )
         assert event.skill_name == "daily-standup"
-        assert event.working_directory == Path("/projects/myapp")
+        assert event.working_directory == _PROJECTS_MYAPP
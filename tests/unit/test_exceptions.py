@@ -10,25 +10,26 @@ from src.exceptions import (
 )
 
 
-def test_base_exception():
-    """Test base exception."""
-    with pytest.raises(CodexCodeTelegramError):
-        raise CodexCodeTelegramError("Test error")
-
-
-def test_configuration_error():
-    """Test configuration error inheritance."""
-    with pytest.raises(CodexCodeTelegramError):
-        raise ConfigurationError("Config error")
-
-    with pytest.raises(ConfigurationError):
-        raise ConfigurationError("Config error")
-
+@pytest.mark.parametrize(
+    "error_class, expected_bases",
+    [
+        pytest.param(CodexCodeTelegramError, [Exception], id="base"),
+        pytest.param(ConfigurationError, [CodexCodeTelegramError], id="configuration"),
+        pytest.param(SecurityError, [CodexCodeTelegramError], id="security"),
+        pytest.param(
+            AuthenticationError,
+            [CodexCodeTelegramError, SecurityError],
+            id="authentication",
+        ),
+    ],
+)
+def test_exception_hierarchy(error_class, expected_bases):
+    """Each exception derives from the base classes callers catch it by."""
+    for base in expected_bases:
+        assert issubclass(error_class, base)
 
-def test_security_error():
-    """Test security error inheritance."""
-    with pytest.raises(CodexCodeTelegramError):
-        raise SecurityError("Security error")
 
-    with pytest.raises(SecurityError):
+def test_raised_error_is_caught_by_base():
+    """A raised subclass is caught by an except on the package base error."""
+    with pytest.raises(CodexCodeTelegramError, match="Auth error"):
         raise AuthenticationError("Auth error")
@@ -1,37 +1,33 @@
 """Tests for the notification service."""
 
-from unittest.mock import AsyncMock
+from typing import Iterator, List
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.events.bus import EventBus
 from src.events.types import AgentResponseEvent
 from src.notifications.service import NotificationService
 
-
-@pytest.fixture
-def event_bus() -> EventBus:
-    return EventBus()
+# Over Telegram's 4096-char limit, with and without a paragraph break to split at
+_LONG_TEXT = "A" * 4000 + "\n\n" + "B" * 200
+_NO_BOUNDARY_TEXT = "A" * 5000
 
 
 @pytest.fixture
-def mock_bot() -> AsyncMock:
-    bot = AsyncMock()
-    bot.send_message = AsyncMock()
-    return bot
+def service(stack) -> NotificationService:
+    return stack.service
 
 
 @pytest.fixture
-def service(event_bus: EventBus, mock_bot: AsyncMock) -> NotificationService:
-    svc = NotificationService(
-        event_bus=event_bus,
-        bot=mock_bot,
-        default_chat_ids=[100, 200],
-    )
-    svc.register()
-    return svc
+def mock_sleep() -> Iterator[AsyncMock]:
+    """Skip the rate-limit waits while still recording that they happened."""
+    with patch(
+        "src.notifications.service.asyncio.sleep", new_callable=AsyncMock
+    ) as sleep:
+        yield sleep
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestNotificationService:
     """Tests for NotificationService."""
 
@@ -43,54 +39,40 @@ class TestNotificationService:
         await service.handle_response(event)
         assert service._send_queue.qsize() == 1
 
-    async def test_resolve_chat_ids_specific(
-        self, service: NotificationService
-    ) -> None:
-        """Specific chat_id takes precedence over defaults."""
-        event = AgentResponseEvent(chat_id=999, text="test")
-        ids = service._resolve_chat_ids(event)
-        assert ids == [999]
-
-    async def test_resolve_chat_ids_default(self, service: NotificationService) -> None:
-        """chat_id=0 falls back to default chat IDs."""
-        event = AgentResponseEvent(chat_id=0, text="test")
-        ids = service._resolve_chat_ids(event)
-        assert ids == [100, 200]
-
-    def test_split_message_short(self, service: NotificationService) -> None:
-        """Short messages are not split."""
-        chunks = service._split_message("short text")
-        assert len(chunks) == 1
-        assert chunks[0] == "short text"
-
-    def test_split_message_long(self, service: NotificationService) -> None:
-        """Long messages are split at boundaries."""
-        text = "A" * 4000 + "\n\n" + "B" * 200
-        chunks = service._split_message(text, max_length=4096)
-        assert len(chunks) >= 1
-        # All content preserved
-        total_len = sum(len(c) for c in chunks)
-        assert total_len > 0
-
-    def test_split_message_no_boundary(self, service: NotificationService) -> None:
-        """Messages without boundaries are hard-split."""
-        text = "A" * 5000  # No newlines or spaces
-        chunks = service._split_message(text, max_length=4096)
-        assert len(chunks) == 2
-        assert len(chunks[0]) == 4096
-        assert len(chunks[1]) == 904
-
     async def test_send_to_telegram(
-        self, service: NotificationService, mock_bot: AsyncMock
+        self,
+        service: NotificationService,
+        fake_bot,
+        mock_sleep: AsyncMock,
     ) -> None:
         """Messages are sent via the Telegram bot."""
         event = AgentResponseEvent(chat_id=123, text="hello world")
         await service._rate_limited_send(123, event)
 
-        mock_bot.send_message.assert_called_once()
-        call_kwargs = mock_bot.send_message.call_args.kwargs
-        assert call_kwargs["chat_id"] == 123
-        assert call_kwargs["text"] == "hello world"
+        assert len(fake_bot.sent) == 1
+        assert fake_bot.sent[0]["chat_id"] == 123
+        assert fake_bot.sent[0]["text"] == "hello world"
+        mock_sleep.assert_not_awaited()
+
+    async def test_send_is_rate_limited_per_chat(
+        self,
+        service: NotificationService,
+        fake_bot,
+        mock_sleep: AsyncMock,
+    ) -> None:
+        """Chunks and back-to-back sends to one chat wait between messages."""
+        event = AgentResponseEvent(chat_id=123, text=_NO_BOUNDARY_TEXT)
+        await service._rate_limited_send(123, event)
+
+        assert len(fake_bot.sent) == 2
+        # One wait after each chunk of the split message
+        assert mock_sleep.await_count == 2
+
+        await service._rate_limited_send(123, AgentResponseEvent(text="again"))
+
+        # The second message waits out the interval since the last send
+        assert mock_sleep.await_count == 3
+        assert mock_sleep.await_args.args[0] > 0
 
     async def test_ignores_non_response_events(
         self, service: NotificationService
@@ -101,3 +83,35 @@ class TestNotificationService:
         event = Event(source="test")
         await service.handle_response(event)
         assert service._send_queue.qsize() == 0
+
+
+class TestNotificationServiceHelpers:
+    """Tests for NotificationService's synchronous helpers."""
+
+    def test_resolve_chat_ids_specific(self, service: NotificationService) -> None:
+        """Specific chat_id takes precedence over defaults."""
+        event = AgentResponseEvent(chat_id=999, text="test")
+        ids = service._resolve_chat_ids(event)
+        assert ids == [999]
+
+    def test_resolve_chat_ids_default(self, service: NotificationService) -> None:
+        """chat_id=0 falls back to default chat IDs."""
+        event = AgentResponseEvent(chat_id=0, text="test")
+        ids = service._resolve_chat_ids(event)
+        assert ids == [100, 200]
+
+    @pytest.mark.parametrize(
+        "text, expected_lengths",
+        [
+            pytest.param("short text", [10], id="short"),
+            pytest.param(_LONG_TEXT, [4000, 200], id="paragraph-boundary"),
+            pytest.param(_NO_BOUNDARY_TEXT, [4096, 904], id="no-boundary"),
+        ],
+    )
+    def test_split_message(
+        self, service: NotificationService, text: str, expected_lengths: List[int]
+    ) -> None:
+        """Long messages split at the last boundary, else hard-split at the limit."""
+        chunks = service._split_message(text, max_length=4096)
+        assert [len(c) for c in chunks] == expected_lengths
+        assert chunks[0] == text[: expected_lengths[0]]
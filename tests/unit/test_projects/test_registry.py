@@ -7,14 +7,24 @@ import pytest
 from src.projects.registry import load_project_registry
 
 
-def test_load_project_registry_valid(tmp_path: Path) -> None:
-    approved = tmp_path / "projects"
-    approved.mkdir()
+@pytest.fixture(scope="module")
+def approved(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Approved directory holding the ``app_one`` and ``app_two`` projects."""
+    approved = tmp_path_factory.mktemp("projects")
     (approved / "app_one").mkdir()
     (approved / "app_two").mkdir()
+    return approved
 
+
+def _write_config(tmp_path: Path, yaml_text: str) -> Path:
     config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
+    config_file.write_text(yaml_text, encoding="utf-8")
+    return config_file
+
+
+def test_load_project_registry_valid(tmp_path: Path, approved: Path) -> None:
+    config_file = _write_config(
+        tmp_path,
         "projects:\n"
         "  - slug: app1\n"
         "    name: App One\n"
@@ -23,7 +33,6 @@ def test_load_project_registry_valid(tmp_path: Path) -> None:
         "    name: App Two\n"
         "    path: app_two\n"
         "    enabled: false\n",
-        encoding="utf-8",
     )
 
     registry = load_project_registry(config_file, approved)
@@ -34,41 +43,31 @@ def test_load_project_registry_valid(tmp_path: Path) -> None:
     assert enabled[0].slug == "app1"
 
 
-def test_load_project_registry_rejects_duplicate_slug(tmp_path: Path) -> None:
-    approved = tmp_path / "projects"
-    approved.mkdir()
-    (approved / "app_one").mkdir()
-    (approved / "app_two").mkdir()
-
-    config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
-        "projects:\n"
-        "  - slug: app\n"
-        "    name: App One\n"
-        "    path: app_one\n"
-        "  - slug: app\n"
-        "    name: App Two\n"
-        "    path: app_two\n",
-        encoding="utf-8",
-    )
-
-    with pytest.raises(ValueError) as exc_info:
-        load_project_registry(config_file, approved)
-
-    assert "Duplicate project slug" in str(exc_info.value)
-
-
-def test_load_project_registry_rejects_outside_approved_dir(tmp_path: Path) -> None:
-    approved = tmp_path / "projects"
-    approved.mkdir()
-
-    config_file = tmp_path / "projects.yaml"
-    config_file.write_text(
-        "projects:\n" "  - slug: app\n" "    name: App\n" "    path: ../outside\n",
-        encoding="utf-8",
-    )
-
-    with pytest.raises(ValueError) as exc_info:
+@pytest.mark.parametrize(
+    "yaml_text, match",
+    [
+        pytest.param(
+            "projects:\n"
+            "  - slug: app\n"
+            "    name: App One\n"
+            "    path: app_one\n"
+            "  - slug: app\n"
+            "    name: App Two\n"
+            "    path: app_two\n",
+            "Duplicate project slug",
+            id="duplicate-slug",
+        ),
+        pytest.param(
+            "projects:\n  - slug: app\n    name: App\n    path: ../outside\n",
+            "outside approved directory",
+            id="outside-approved-dir",
+        ),
+    ],
+)
+def test_load_project_registry_rejects(
+    tmp_path: Path, approved: Path, yaml_text: str, match: str
+) -> None:
+    config_file = _write_config(tmp_path, yaml_text)
+
+    with pytest.raises(ValueError, match=match):
         load_project_registry(config_file, approved)
-
-    assert "outside approved directory" in str(exc_info.value)